@@ -0,0 +1,360 @@
+"""
+SVD Batch Compressor
+====================
+Headless command line tool for compressing many images with SVDCompressor.
+
+Images are distributed over a process pool. For every image the tool writes
+the compressed factors (*.svdf, see svd_storage) and optionally a PNG preview
+of the reconstruction, and adds one row (time, rank, error, bytes) to a
+CSV or JSON report. Output names mirror the input path relative to the
+non-wildcard part of its pattern ("scans/**/*.png" writes scans/a/x.png to
+OUTPUT_DIR/a/x.svdf), so equal file names in different folders do not
+overwrite each other. tkinter is never imported on this path, so the tool
+runs on servers without a display.
+
+With several worker processes every worker gets cores // workers BLAS
+threads (via threadpoolctl if installed, otherwise via the OMP/OpenBLAS/MKL
+environment variables of the spawned workers), so the pool does not start
+workers × cores BLAS threads.
+
+Usage:
+    python svd_batch.py "photos/*.jpg" -o out --rank 50
+    python svd_batch.py "scans/**/*.png" -o out --error 5000 --workers 16
+    python svd_batch.py img.png -o out --size 200 --encoding uint8 --report report.csv
+    python svd_batch.py "photos/*.jpg" -o out --error 5000 --per-channel --color-space klt
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # optional: then only the environment variables apply
+    threadpool_limits = None
+
+from svd_cache import FactorCache
+from svd_compressor import COLOR_SPACES, EXECUTIONS, Ranks, SVDCompressor
+from svd_storage import ENCODINGS
+
+
+REPORT_FIELDS = [
+    'input', 'factors', 'preview', 'width', 'height', 'channels', 'rank',
+    'error', 'relative_error', 'bytes', 'original_bytes',
+    'load_time', 'svd_time', 'write_time', 'total_time', 'status',
+]
+
+# Thread count variables of OpenMP, OpenBLAS and MKL, read when BLAS loads
+BLAS_ENV_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+
+
+def select_rank(
+    compressor: SVDCompressor,
+    rank: Optional[int],
+    error: Optional[float],
+    size_kb: Optional[float],
+    encoding: str,
+    per_channel: bool = False,
+) -> Ranks:
+    """
+    Pick the rank for one of the targets (rank, error or size in KB).
+
+    Uses the binary searches of SVDCompressor: the smallest rank with
+    compute_error(k) ≤ error, or the largest rank whose factor file fits
+    into size_kb. With per_channel, the error target is met with one rank
+    per channel (SVDCompressor.allocate_ranks).
+    """
+    if rank is not None:
+        return max(1, min(rank, compressor.get_max_rank()))
+    if error is not None:
+        if per_channel:
+            return compressor.allocate_ranks(error)
+        return compressor.rank_for_error(error)
+    return compressor.rank_for_size(int(size_kb * 1024), encoding)
+
+
+def compress_file(path: str, options: Dict[str, object],
+                  name: Optional[str] = None) -> Dict[str, object]:
+    """
+    Compress one image; runs in a worker process.
+
+    Args:
+        path: Input image
+        options: Batch options (see main)
+        name: Output name relative to the output directory, without
+            extension (default: file name of path)
+
+    Returns:
+        Report row (see REPORT_FIELDS)
+    """
+    row: Dict[str, object] = {'input': path, 'status': 'ok'}
+    start = time.perf_counter()
+
+    try:
+        cache = None
+        if options['cache_dir'] is not None:
+            cache = FactorCache(options['cache_dir'], int(options['cache_size'] * 1024**2))
+        compressor = SVDCompressor(options['precision'], cache,
+                                   options['execution'], options['thread_split'],
+                                   options['color_space'])
+        data = compressor.load_image(path)
+        row['load_time'] = time.perf_counter() - start
+
+        t = time.perf_counter()
+        compressor.compute_svd(data, k_max=options['k_max'])
+        row['svd_time'] = time.perf_counter() - t
+
+        k = select_rank(
+            compressor, options['rank'], options['error'],
+            options['size'], options['encoding'], options['per_channel']
+        )
+
+        t = time.perf_counter()
+        stem = name or os.path.splitext(os.path.basename(path))[0]
+        factors_path = os.path.join(options['output_dir'], stem + '.svdf')
+        os.makedirs(os.path.dirname(factors_path), exist_ok=True)
+        row['bytes'] = compressor.save_factors(factors_path, k, options['encoding'])
+        row['factors'] = factors_path
+
+        if options['preview']:
+            preview_path = os.path.join(options['output_dir'], stem + '_preview.png')
+            Image.fromarray(compressor.reconstruct(k)).save(preview_path)
+            row['preview'] = preview_path
+        row['write_time'] = time.perf_counter() - t
+
+        m, n, n_channels = compressor.original_shape
+        error = compressor.compute_error(k)
+        total = compressor.compute_error(0)
+        row.update({
+            'width': n,
+            'height': m,
+            'channels': n_channels,
+            'rank': k,
+            'error': error,
+            'relative_error': error / total if total > 0 else 0.0,
+            'original_bytes': m * n * n_channels,
+        })
+    except Exception as exc:  # one broken file must not stop the batch
+        row['status'] = f'error: {exc}'
+
+    row['total_time'] = time.perf_counter() - start
+    return row
+
+
+def parse_thread_split(value: str) -> Tuple[int, int]:
+    """Parse 'WORKERSxBLAS', e.g. '3x4' for 3 channel threads with 4 BLAS threads each."""
+    try:
+        workers, blas_threads = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WORKERSxBLAS, e.g. 3x4, got '{value}'")
+    return workers, blas_threads
+
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand glob patterns (recursive '**' allowed), keeping order."""
+    return [path for path, _ in expand_with_names(patterns)]
+
+
+def _pattern_base(pattern: str) -> str:
+    """Directory part of a pattern before the first wildcard component."""
+    if not glob.has_magic(pattern):
+        return os.path.dirname(pattern)
+    parts = pattern.replace(os.sep, '/').split('/')
+    prefix = []
+    for part in parts:
+        if glob.has_magic(part):
+            break
+        prefix.append(part)
+    return '/'.join(prefix)
+
+
+def expand_with_names(patterns: List[str]) -> List[Tuple[str, str]]:
+    """
+    Expand glob patterns into (path, output name) pairs.
+
+    The output name is the path relative to the pattern's base directory,
+    without extension. Names that still collide (e.g. from two patterns)
+    get a numeric suffix, so no two inputs share an output file.
+    """
+    inputs: List[Tuple[str, str]] = []
+    seen_paths = set()
+    seen_names = set()
+    for pattern in patterns:
+        base = _pattern_base(pattern)
+        for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+            if path in seen_paths:
+                continue
+            seen_paths.add(path)
+            name = os.path.splitext(os.path.relpath(path, base or os.curdir))[0]
+            if name.startswith(os.pardir):
+                name = os.path.splitext(os.path.basename(path))[0]
+            unique, count = name, 1
+            while os.path.normcase(unique) in seen_names:
+                count += 1
+                unique = f"{name}_{count}"
+            seen_names.add(os.path.normcase(unique))
+            inputs.append((path, unique))
+    return inputs
+
+
+def write_report(rows: List[Dict[str, object]], path: str) -> None:
+    """Write the report as JSON (*.json) or CSV (anything else)."""
+    if path.lower().endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: row.get(key, '') for key in REPORT_FIELDS})
+
+
+def _limit_blas(threads: int) -> None:
+    """Pool initializer: limit the BLAS threads of this worker process."""
+    if threadpool_limits is not None:
+        # Also works after fork, where BLAS is already loaded
+        threadpool_limits(limits=threads, user_api='blas')
+
+
+@contextmanager
+def _blas_environment(threads: int) -> Iterator[None]:
+    """
+    Set BLAS_ENV_VARS to threads while workers are started.
+
+    Only spawned workers, which load BLAS anew, read them; the BLAS of
+    this process and of forked workers keeps its thread count.
+    """
+    saved = {var: os.environ.get(var) for var in BLAS_ENV_VARS}
+    os.environ.update({var: str(threads) for var in BLAS_ENV_VARS})
+    try:
+        yield
+    finally:
+        for var, value in saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def run_batch(paths: List[str], options: Dict[str, object], workers: int,
+              names: Optional[List[str]] = None) -> List[Dict[str, object]]:
+    """
+    Compress all paths, in parallel if workers > 1.
+
+    The cores are shared among the worker processes: each one runs BLAS
+    (and with execution='threads' its channel threads) on cores // workers
+    threads instead of on all cores.
+    """
+    if names is None:
+        names = [None] * len(paths)
+    if workers <= 1:
+        return [compress_file(path, options, name) for path, name in zip(paths, names)]
+
+    blas_threads = max(1, (os.cpu_count() or 1) // workers)
+    if options['execution'] == 'threads' and options['thread_split'] is None:
+        channel_threads = min(3, blas_threads)
+        options = dict(options, thread_split=(channel_threads, blas_threads // channel_threads))
+
+    with _blas_environment(blas_threads), ProcessPoolExecutor(
+        max_workers=workers, initializer=_limit_blas, initargs=(blas_threads,)
+    ) as pool:
+        return list(pool.map(compress_file, paths, [options] * len(paths), names))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compress images with truncated SVD (headless batch mode)."
+    )
+    parser.add_argument('inputs', nargs='+', help="Input files or glob patterns")
+    parser.add_argument('-o', '--output-dir', default='svd_output',
+                        help="Directory for factor files and previews")
+
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--rank', type=int, help="Fixed rank k")
+    target.add_argument('--error', type=float,
+                        help="Maximum Frobenius error ||A - A_k||_F")
+    target.add_argument('--size', type=float,
+                        help="Maximum factor file size in KB")
+
+    parser.add_argument('--per-channel', action='store_true',
+                        help="With --error: one rank per channel, fewest bytes")
+    parser.add_argument('--color-space', choices=COLOR_SPACES, default='rgb',
+                        help="Decompose RGB images in a decorrelated color space")
+    parser.add_argument('--encoding', choices=ENCODINGS, default='float32',
+                        help="Encoding of the stored factors")
+    parser.add_argument('--precision', choices=('float32', 'float64'), default=None,
+                        help="Working precision (default: float32 for 8-bit images)")
+    parser.add_argument('--k-max', type=int, default=None,
+                        help="Compute only the leading k_max triplets (randomized SVD)")
+    parser.add_argument('--execution', choices=EXECUTIONS, default='stacked',
+                        help="How the channels of one image are decomposed")
+    parser.add_argument('--thread-split', type=parse_thread_split, default=None,
+                        help="Channel threads and BLAS threads per thread for "
+                             "--execution threads, e.g. 3x4")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Directory of a persistent factor cache (default: no cache)")
+    parser.add_argument('--cache-size', type=float, default=2048,
+                        help="Size cap of the factor cache in MB")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes")
+    parser.add_argument('--report', default=None,
+                        help="Report file (*.json or *.csv, default: OUTPUT_DIR/report.csv)")
+    parser.add_argument('--no-preview', action='store_true',
+                        help="Do not write PNG previews")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the batch tool; returns the process exit code."""
+    args = parse_args(argv)
+    inputs = expand_with_names(args.inputs)
+    paths = [path for path, _ in inputs]
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    options = {
+        'output_dir': args.output_dir,
+        'rank': args.rank,
+        'error': args.error,
+        'size': args.size,
+        'encoding': args.encoding,
+        'k_max': args.k_max,
+        'precision': args.precision,
+        'execution': args.execution,
+        'color_space': args.color_space,
+        'per_channel': args.per_channel,
+        'thread_split': args.thread_split,
+        'cache_dir': args.cache_dir,
+        'cache_size': args.cache_size,
+        'preview': not args.no_preview,
+    }
+
+    start = time.perf_counter()
+    rows = run_batch(paths, options, min(args.workers, max(len(paths), 1)),
+                     [name for _, name in inputs])
+    elapsed = time.perf_counter() - start
+
+    report = args.report or os.path.join(args.output_dir, 'report.csv')
+    write_report(rows, report)
+
+    failed = [row for row in rows if row['status'] != 'ok']
+    print(f"{len(rows) - len(failed)}/{len(rows)} Bilder komprimiert in {elapsed:.1f} s, "
+          f"Bericht: {report}")
+    for row in failed:
+        print(f"  {row['input']}: {row['status']}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
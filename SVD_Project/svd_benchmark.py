@@ -0,0 +1,283 @@
+"""
+SVD Benchmark
+=============
+Reproducible performance benchmark for SVDCompressor.
+
+Every case is one image: synthetic images of several sizes with a fast,
+slow or flat singular value spectrum (generated from a fixed seed and
+written as PNG, so load_image is part of the measurement), plus optional
+real images. Per case the harness measures
+
+    load_image          decode the PNG
+    compute_svd         full SVD of all channels
+    compute_svd_kmax    randomized SVD of the leading K_MAX triplets
+    reconstruct         full-resolution reconstruction at several k, rebuilt
+                        from rank 0 (not the incremental slider update)
+    compute_error       error sweep over all ranks
+    preview             GUI path: prepare_preview + slider sweep over k
+
+Times are the median and minimum over repeated runs (time.perf_counter);
+the peak memory of every operation is measured with tracemalloc in a
+separate run, so its overhead does not distort the times.
+
+Results are written as JSON. With --baseline, the medians are compared
+against a stored result file and operations that became slower than the
+threshold are reported as regressions (exit code 1).
+
+Usage:
+    python svd_benchmark.py -o baseline.json
+    python svd_benchmark.py -o current.json --baseline baseline.json
+    python svd_benchmark.py --sizes 512x512 2048x1536 --images photo.jpg
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from svd_compressor import SVDCompressor
+
+
+SPECTRA = ('fast', 'slow', 'flat')
+DEFAULT_SIZES = ((256, 256), (512, 768), (1024, 1024))
+K_MAX = 50
+RECONSTRUCT_RANKS = (5, 20, 50, 100)
+
+
+def synthetic_image(m: int, n: int, spectrum: str, channels: int = 3, seed: int = 0) -> np.ndarray:
+    """
+    Generate a uint8 image with a prescribed singular value decay.
+
+    Every channel is U diag(σ) Vᵀ with random orthonormal U, V and
+    σᵢ = 0.8^i ('fast'), 1/(i+1) ('slow') or uniform noise ('flat'),
+    rescaled to [0, 255].
+    """
+    if spectrum not in SPECTRA:
+        raise ValueError(f"Unknown spectrum '{spectrum}', expected one of {SPECTRA}")
+
+    rng = np.random.default_rng(seed)
+    r = min(m, n)
+    i = np.arange(r)
+    sigma = {'fast': 0.8**i, 'slow': 1.0 / (i + 1), 'flat': rng.random(r)}[spectrum]
+
+    image = np.empty((m, n, channels), dtype=np.uint8)
+    for c in range(channels):
+        U, _ = np.linalg.qr(rng.standard_normal((m, r)))
+        V, _ = np.linalg.qr(rng.standard_normal((n, r)))
+        A = (U * sigma) @ V.T
+        A = (A - A.min()) / (A.max() - A.min()) * 255
+        image[:, :, c] = np.rint(A).astype(np.uint8)
+    return image
+
+
+def time_call(func: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Median and minimum wall time of func over repeats runs (after one warm-up)."""
+    func()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'median': statistics.median(times), 'min': min(times)}
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Peak traced allocation of one call in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def case_operations(path: str) -> List[Tuple[str, Callable[[], object]]]:
+    """
+    Build the measured operations for one image.
+
+    Each operation works on its own prepared compressor, so it measures only
+    the named step.
+    """
+    full = SVDCompressor()
+    data = full.load_image(path)
+    full.compute_svd(data)
+    max_rank = full.get_max_rank()
+    ranks = [k for k in RECONSTRUCT_RANKS if k <= max_rank]
+
+    def load():
+        SVDCompressor().load_image(path)
+
+    def svd():
+        SVDCompressor().compute_svd(data)
+
+    def svd_kmax():
+        SVDCompressor().compute_svd(data, k_max=min(K_MAX, max_rank))
+
+    def reconstruct(k):
+        full.reconstruct(0)  # cheap; forces a rebuild of rank k
+        full.reconstruct(k)
+
+    def error_sweep():
+        for k in range(max_rank + 1):
+            full.compute_error(k)
+
+    def preview():
+        full.prepare_preview((400, 400))
+        for k in range(1, max_rank + 1, max(1, max_rank // 50)):
+            full.reconstruct_preview(k)
+
+    operations = [
+        ('load_image', load),
+        ('compute_svd', svd),
+        ('compute_svd_kmax', svd_kmax),
+    ]
+    for k in ranks:
+        operations.append((f'reconstruct_k{k}', lambda k=k: reconstruct(k)))
+    operations += [('compute_error', error_sweep), ('preview', preview)]
+    return operations
+
+
+def run_benchmark(
+    cases: List[Tuple[str, str]],
+    repeats: int = 5,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, object]:
+    """
+    Measure all operations for all cases.
+
+    Args:
+        cases: List of (case name, image path)
+        repeats: Timed runs per operation
+        progress: Called with a status line per operation
+
+    Returns:
+        Result dictionary with machine information and one entry per
+        (case, operation)
+    """
+    results = []
+    for name, path in cases:
+        with Image.open(path) as img:
+            width, height = img.size
+        for operation, func in case_operations(path):
+            entry = {'case': name, 'operation': operation, 'width': width, 'height': height}
+            entry.update(time_call(func, repeats))
+            entry['peak_bytes'] = peak_memory(func)
+            results.append(entry)
+            if progress is not None:
+                progress(f"{name:24s} {operation:20s} {entry['median'] * 1e3:10.2f} ms "
+                         f"{entry['peak_bytes'] / 1024**2:8.1f} MB")
+
+    return {
+        'machine': {
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+        },
+        'repeats': repeats,
+        'results': results,
+    }
+
+
+def compare(
+    current: Dict[str, object],
+    baseline: Dict[str, object],
+    threshold: float = 0.2,
+) -> List[Dict[str, object]]:
+    """
+    Find operations whose median time grew by more than threshold.
+
+    Returns:
+        List of regressions with case, operation, both medians and the ratio
+    """
+    reference = {(r['case'], r['operation']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        base = reference.get((result['case'], result['operation']))
+        if base is None or base['median'] <= 0:
+            continue
+        ratio = result['median'] / base['median']
+        if ratio > 1.0 + threshold:
+            regressions.append({
+                'case': result['case'],
+                'operation': result['operation'],
+                'baseline': base['median'],
+                'current': result['median'],
+                'ratio': ratio,
+            })
+    return regressions
+
+
+def parse_size(value: str) -> Tuple[int, int]:
+    """Parse 'HEIGHTxWIDTH', e.g. '512x768'."""
+    try:
+        m, n = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected HEIGHTxWIDTH, e.g. 512x768, got '{value}'")
+    return m, n
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark SVDCompressor.")
+    parser.add_argument('-o', '--output', default='benchmark.json',
+                        help="Result file (JSON)")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=list(DEFAULT_SIZES),
+                        help="Synthetic image sizes as HEIGHTxWIDTH")
+    parser.add_argument('--spectra', nargs='+', choices=SPECTRA, default=list(SPECTRA),
+                        help="Singular value spectra of the synthetic images")
+    parser.add_argument('--images', nargs='*', default=[],
+                        help="Additional real images")
+    parser.add_argument('--repeats', type=int, default=5,
+                        help="Timed runs per operation")
+    parser.add_argument('--baseline', default=None,
+                        help="Earlier result file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative slowdown that counts as regression")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the benchmark; returns 1 if regressions were found."""
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cases = []
+        for m, n in args.sizes:
+            for spectrum in args.spectra:
+                name = f'{m}x{n}_{spectrum}'
+                path = os.path.join(directory, name + '.png')
+                Image.fromarray(synthetic_image(m, n, spectrum)).save(path)
+                cases.append((name, path))
+        cases += [(os.path.basename(path), path) for path in args.images]
+
+        result = run_benchmark(cases, args.repeats, progress=print)
+
+    with open(args.output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f"Ergebnisse: {args.output}")
+
+    if args.baseline is None:
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(result, baseline, args.threshold)
+    for r in regressions:
+        print(f"  Regression {r['case']} {r['operation']}: "
+              f"{r['baseline'] * 1e3:.2f} ms -> {r['current'] * 1e3:.2f} ms "
+              f"(x{r['ratio']:.2f})", file=sys.stderr)
+    print(f"{len(regressions)} Regressionen gegenüber {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+SVD Factor Cache
+================
+Persistent on-disk cache of computed SVD factors.
+
+Entries are factor files (see svd_storage) named after a content hash of the
+decoded pixel data together with the SVD settings (working precision, k_max,
+oversampling, ...). A hit is opened memory-mapped, so reopening an image
+costs a hash of its pixels instead of a full SVD.
+
+The cache size is capped; when a new entry exceeds the cap, the least
+recently used entries (oldest modification time, refreshed on every hit) are
+deleted. Entries are written to a temporary file and renamed into place, so
+several processes can share one cache directory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'svd_compressor')
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+class FactorCache:
+    """
+    LRU cache of factor files in a directory.
+
+    Args:
+        directory: Cache directory (default: $SVD_CACHE_DIR or ~/.cache/svd_compressor)
+        max_bytes: Size cap of all entries together
+    """
+
+    SUFFIX = '.svdf'
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.environ.get('SVD_CACHE_DIR', DEFAULT_DIRECTORY)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(data: np.ndarray, settings: Dict[str, object]) -> str:
+        """
+        Content hash of the pixel data, its shape and dtype, and the settings.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(json.dumps(
+            {'shape': list(data.shape), 'dtype': data.dtype.name, 'settings': settings},
+            sort_keys=True
+        ).encode('utf-8'))
+        digest.update(memoryview(np.ascontiguousarray(data)).cast('B'))
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        """File path of the entry for key."""
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        Return the path of a cached entry and mark it as recently used,
+        or None on a miss.
+        """
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def store(self, key: str, write: Callable[[str], int]) -> str:
+        """
+        Add an entry; write(path) must create the factor file at path.
+
+        Returns:
+            Path of the new entry
+        """
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.directory)
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self.evict(keep=key)
+        return self.path(key)
+
+    def entries(self):
+        """List (mtime, size, path) of all entries, least recently used first."""
+        result = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # removed by another process
+                continue
+            result.append((stat.st_mtime, stat.st_size, path))
+        return sorted(result)
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used entries until the size cap holds."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        keep_path = self.path(keep) if keep is not None else None
+
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep_path:
+                continue
+            try:
+                os.remove(path)
+            except OSError:  # removed concurrently or still mapped
+                continue
+            total -= size
+
+    def clear(self) -> None:
+        """Delete all entries."""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
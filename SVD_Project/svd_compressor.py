@@ -1,7 +1,7 @@
 """
 SVD Image Compressor
 ====================
-Interactive GUI application for image compression using Singular Value Decomposition.
+Image compression using Singular Value Decomposition.
 
 Authors: Maximilian Bazlov, Emmanuel Nana Nana
 Course: B-AMP3 - Seminar zu Simulationstools
@@ -10,13 +10,227 @@ Institution: Technische Hochschule Nürnberg Georg Simon Ohm
 This application demonstrates image compression using the mathematical concept of
 low-rank matrix approximation via SVD. The Eckart-Young-Mirsky theorem guarantees
 that the rank-k approximation is optimal in the Frobenius norm sense.
+
+The compression core in this module does not depend on tkinter; the
+interactive GUI lives in svd_gui.py and the headless batch tool in
+svd_batch.py.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from PIL import Image, ImageTk
-import tkinter as tk
-from tkinter import filedialog, ttk
-from typing import Tuple, List, Optional
+from PIL import Image
+from typing import Tuple, List, Optional, Dict, Sequence, Union
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # optional: without it BLAS keeps its own thread count
+    threadpool_limits = None
+
+from svd_cache import FactorCache
+from svd_storage import FactorFile, FactorWriter
+
+# A rank is either one k for all channels or one k per channel
+Ranks = Union[int, Sequence[int]]
+
+
+def randomized_svd(
+    A: np.ndarray,
+    k: int,
+    oversampling: int = 10,
+    power_iterations: int = 2,
+    seed: Optional[int] = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the leading k singular triplets of A with a randomized range finder.
+    
+    A Gaussian sketch Y = AΩ with k + oversampling columns captures the dominant
+    column space of A; q power iterations (AAᵀ)^q sharpen it when the spectrum
+    decays slowly. With Q an orthonormal basis of the sketch, the SVD of the
+    small matrix B = QᵀA yields A ≈ (QŨ) Σ Vᵀ (Halko, Martinsson & Tropp, 2011).
+    
+    Cost: O(m·n·(k + p)·(2q + 2)) instead of O(m·n·min(m,n)) for the full SVD.
+    
+    A may also be a stack of shape (..., m, n); all matrices then share the
+    test matrix and are processed by the stacked forms of matmul, qr and svd.
+    
+    Returns:
+        Tuple (U, s, Vt) with U ∈ ℝ^(m×k), s ∈ ℝ^k, Vt ∈ ℝ^(k×n)
+        (with the leading stack dimensions of A)
+    """
+    m, n = A.shape[-2:]
+    sketch_size = min(k + oversampling, m, n)
+    rng = np.random.default_rng(seed)
+    At = np.swapaxes(A, -1, -2)
+    
+    omega = rng.standard_normal((n, sketch_size)).astype(A.dtype, copy=False)
+    Q, _ = np.linalg.qr(A @ omega)
+    
+    # Re-orthonormalize after every product so that small singular
+    # directions are not lost to rounding errors
+    for _ in range(power_iterations):
+        Z, _ = np.linalg.qr(At @ Q)
+        Q, _ = np.linalg.qr(A @ Z)
+    
+    B = np.swapaxes(Q, -1, -2) @ A
+    U_small, s, Vt = np.linalg.svd(B, full_matrices=False)
+    U = Q @ U_small
+    
+    return U[..., :k], s[..., :k], Vt[..., :k, :]
+
+
+PRECISIONS = {'float32': np.float32, 'float64': np.float64}
+
+# How compute_svd decomposes the channels (see SVDCompressor)
+EXECUTIONS = ('stacked', 'threads', 'sequential')
+
+# Color spaces in which RGB images are decomposed (see color_matrix)
+COLOR_SPACES = ('rgb', 'luma_chroma', 'klt')
+
+# Orthonormal luma/chroma basis: brightness, red-blue, green-magenta
+LUMA_CHROMA = np.array([
+    [1.0, 1.0, 1.0],
+    [1.0, 0.0, -1.0],
+    [1.0, -2.0, 1.0],
+]) / np.array([[np.sqrt(3.0)], [np.sqrt(2.0)], [np.sqrt(6.0)]])
+
+
+def color_matrix(color_space: str, data: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Orthonormal 3×3 transform M from RGB to a decorrelated color space.
+    
+    A pixel x ∈ ℝ³ is mapped to y = M x, an image of shape (m, n, 3) to
+    data @ Mᵀ, and back with y @ M. Since M is orthonormal, ||A - Ã||_F is
+    the same in both spaces, so compute_error stays exact in RGB. (The
+    JPEG YCbCr matrix is not orthonormal; errors measured on its channels
+    would not be RGB errors.)
+    
+    'luma_chroma' is the fixed basis LUMA_CHROMA, 'klt' the Karhunen-Loève
+    transform of the image: the eigenvectors of the 3×3 channel Gram matrix,
+    ordered by descending energy.
+    
+    Returns:
+        float64 matrix M, or None for 'rgb'
+    """
+    if color_space not in COLOR_SPACES:
+        raise ValueError(f"color_space must be one of {COLOR_SPACES}")
+    if color_space == 'rgb':
+        return None
+    if color_space == 'luma_chroma':
+        return LUMA_CHROMA.copy()
+    
+    pixels = data.reshape(-1, 3)
+    gram = np.einsum('pi,pj->ij', pixels, pixels, dtype=np.float64)
+    _, vectors = np.linalg.eigh(gram)
+    M = vectors[:, ::-1].T
+    # Deterministic signs: largest component of every row positive
+    signs = np.sign(M[np.arange(3), np.abs(M).argmax(axis=1)])
+    return M * signs[:, np.newaxis]
+
+
+def squared_norm(x: np.ndarray) -> float:
+    """Squared Frobenius/Euclidean norm of a 1D or 2D array, accumulated in float64."""
+    subscripts = 'ij,ij->' if x.ndim == 2 else 'i,i->'
+    return float(np.einsum(subscripts, x, x, dtype=np.float64))
+
+
+def area_resample_matrix(n_in: int, n_out: int, dtype=np.float64) -> np.ndarray:
+    """
+    Build the linear area-averaging (box filter) operator ℝ^n_in → ℝ^n_out.
+    
+    Output sample i is the mean of the input interval [i·n_in/n_out,
+    (i+1)·n_in/n_out), with partially covered input pixels weighted by their
+    overlap. Since the operator is linear, downsampling the factors gives the
+    downsampled reconstruction: R A Cᵀ = (R U) Σ (C Vᵀᵀ)ᵀ.
+    
+    Returns:
+        Matrix of shape (n_out, n_in) whose rows sum to one
+    """
+    edges = np.linspace(0.0, n_in, n_out + 1)
+    pixels = np.arange(n_in)
+    overlap = (
+        np.minimum(edges[1:, np.newaxis], pixels + 1)
+        - np.maximum(edges[:-1, np.newaxis], pixels)
+    )
+    R = np.clip(overlap, 0.0, None) / np.diff(edges)[:, np.newaxis]
+    return R.astype(dtype, copy=False)
+
+
+class RankAccumulator:
+    """
+    Incremental rank-k reconstruction of a set of channel factorizations.
+    
+    Keeps one float accumulator A_k per channel and moves from rank k₁ to k₂
+    by adding or subtracting only the block of rank |k₂ - k₁|:
+    
+        A_k₂ = A_k₁ ± U[:, k₁:k₂] · diag(s[k₁:k₂]) · Vt[k₁:k₂, :]
+    
+    The diagonal scaling is applied by broadcasting over the columns of U
+    instead of forming a dense diagonal matrix. Moving the rank by Δ costs
+    O(Δ·m·n) instead of O(k·m·n) for a rebuild from scratch.
+    """
+    
+    def __init__(
+        self,
+        U_list: List[np.ndarray],
+        S_list: List[np.ndarray],
+        V_list: List[np.ndarray],
+        refresh_interval: int = 256,
+    ):
+        self.U_list = U_list
+        self.S_list = S_list
+        self.V_list = V_list
+        # Incremental updates accumulate rounding errors; rebuild the
+        # accumulator from scratch after this many updates
+        self.refresh_interval = refresh_interval
+        
+        self.ranks: List[int] = [0] * len(S_list)
+        self.updates: List[int] = [0] * len(S_list)
+        self.accumulators: List[np.ndarray] = []
+        self._scratch: List[np.ndarray] = []
+        
+        for U, s, Vt in zip(U_list, S_list, V_list):
+            dtype = np.result_type(U, s, Vt)
+            self.accumulators.append(np.zeros((U.shape[0], Vt.shape[1]), dtype=dtype))
+            self._scratch.append(np.empty((U.shape[0], Vt.shape[1]), dtype=dtype))
+    
+    def update(self, k: Ranks) -> List[np.ndarray]:
+        """
+        Move all channel accumulators to rank k (or one rank per channel).
+        
+        Returns:
+            List of float accumulators (one m×n array per channel). The arrays
+            are owned by the accumulator and change on the next update.
+        """
+        ranks = [k] * len(self.S_list) if np.isscalar(k) else list(k)
+        
+        for c, (U, s, Vt) in enumerate(zip(self.U_list, self.S_list, self.V_list)):
+            k_old = self.ranks[c]
+            k_new = max(0, min(int(ranks[c]), len(s)))
+            if k_new == k_old:
+                continue
+            
+            acc = self.accumulators[c]
+            delta = abs(k_new - k_old)
+            
+            if delta >= k_new or self.updates[c] >= self.refresh_interval:
+                # Rebuilding is not more expensive than the update
+                np.matmul(U[:, :k_new] * s[:k_new], Vt[:k_new, :], out=acc)
+                self.updates[c] = 0
+            else:
+                lo, hi = min(k_old, k_new), max(k_old, k_new)
+                block = self._scratch[c]
+                np.matmul(U[:, lo:hi] * s[lo:hi], Vt[lo:hi, :], out=block)
+                if k_new > k_old:
+                    acc += block
+                else:
+                    acc -= block
+                self.updates[c] += 1
+                
+            self.ranks[c] = k_new
+            
+        return self.accumulators
 
 
 class SVDCompressor:
@@ -30,69 +244,340 @@ class SVDCompressor:
     
     The rank-k approximation A_k = Σᵢ₌₁ᵏ σᵢ uᵢ vᵢᵀ minimizes ||A - B||_F
     over all matrices B with rank(B) ≤ k.
+    
+    Precision:
+        With precision=None, 8-bit images (and float32 input) are processed in
+        float32, which halves memory and roughly halves the LAPACK time; other
+        inputs stay in float64. 'float32' or 'float64' force the working
+        precision for load_image, compute_svd and reconstruct. Error sums are
+        always accumulated in float64; check_precision compares the rank-k
+        errors against a float64 reference.
+    
+    Cache:
+        With a FactorCache, compute_svd first looks up the factors by a hash
+        of the pixel data and the SVD settings and loads them memory-mapped
+        on a hit; computed factors are added to the cache.
+    
+    Execution:
+        compute_svd copies the image once into a channel-major contiguous
+        stack (channels, m, n), so LAPACK never has to copy strided channel
+        views. 'stacked' decomposes the stack with one call of the stacked
+        np.linalg.svd (or the stacked randomized_svd), 'threads' runs one
+        channel per worker thread, 'sequential' one channel after another.
+        thread_split = (workers, blas_threads) partitions the cores for
+        'threads': default min(channels, cores) workers with
+        cores // workers BLAS threads each. The BLAS limit needs the optional
+        threadpoolctl package and is ignored without it.
+    
+    Color space:
+        With color_space='luma_chroma' or 'klt', RGB images are rotated into
+        a decorrelated space before compute_svd (see color_matrix) and back
+        in reconstruct. Most of the energy then sits in the first channel,
+        and allocate_ranks gives each channel its own rank.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        precision: Optional[str] = None,
+        cache: Optional[FactorCache] = None,
+        execution: str = 'stacked',
+        thread_split: Optional[Tuple[int, int]] = None,
+        color_space: str = 'rgb',
+    ):
+        if precision is not None and precision not in PRECISIONS:
+            raise ValueError(f"precision must be one of {tuple(PRECISIONS)} or None")
+        if execution not in EXECUTIONS:
+            raise ValueError(f"execution must be one of {EXECUTIONS}")
+        if color_space not in COLOR_SPACES:
+            raise ValueError(f"color_space must be one of {COLOR_SPACES}")
+        self.precision = precision
+        self.cache = cache
+        self.execution = execution
+        self.thread_split = thread_split
+        self.color_space = color_space
+        # RGB → working color space transform (None: channels are RGB)
+        self.color_matrix: Optional[np.ndarray] = None
+        self.dtype: np.dtype = np.dtype(PRECISIONS[precision or 'float32'])
         self.U_list: List[np.ndarray] = []
         self.S_list: List[np.ndarray] = []
         self.V_list: List[np.ndarray] = []
+        # Squared Frobenius norm not captured by the stored factors
+        # (zero for a full SVD, residual of the sketch for a partial one)
+        self.tail_sq: List[float] = []
+        # tail_energy[c][k] = ||A_c - A_c,k||_F² for k = 0, ..., r_c (float64)
+        self.tail_energy: List[np.ndarray] = []
+        self.accuracy_report: Optional[Dict[str, object]] = None
+        self._accumulator: Optional[RankAccumulator] = None
+        # Factors downsampled to display resolution (see prepare_preview)
+        self.preview_size: Tuple[int, int] = (400, 400)
+        self._preview_accumulator: Optional[RankAccumulator] = None
         self.original_shape: Optional[Tuple[int, int, int]] = None
         self.is_grayscale: bool = False
         
     def load_image(self, filepath: str) -> np.ndarray:
-        """Load and prepare image for SVD computation."""
+        """Load and prepare image for SVD computation (in the working precision)."""
         img = Image.open(filepath)
         
         # Convert to RGB or grayscale
         if img.mode == 'L':
             self.is_grayscale = True
-            data = np.array(img, dtype=np.float64)
+            data = np.asarray(img)
             data = data[:, :, np.newaxis]
         else:
             self.is_grayscale = False
             img = img.convert('RGB')
-            data = np.array(img, dtype=np.float64)
+            data = np.asarray(img)
             
+        data = data.astype(self._working_dtype(data))
         self.original_shape = data.shape
         return data
     
-    def compute_svd(self, data: np.ndarray) -> None:
+    def _working_dtype(self, data: np.ndarray) -> np.dtype:
+        """Working precision for data (see class docstring)."""
+        if self.precision is not None:
+            return np.dtype(PRECISIONS[self.precision])
+        if data.dtype in (np.uint8, np.float32):
+            return np.dtype(np.float32)
+        return np.dtype(np.float64)
+    
+    def compute_svd(
+        self,
+        data: np.ndarray,
+        k_max: Optional[int] = None,
+        oversampling: int = 10,
+        power_iterations: int = 2,
+        seed: Optional[int] = 0,
+    ) -> None:
         """
         Compute SVD for each color channel.
         
         Uses numpy.linalg.svd with full_matrices=False for efficiency
         (thin SVD: only computes min(m,n) singular vectors).
+        
+        If k_max is given, only the leading k_max singular triplets are
+        computed with a randomized range finder (see randomized_svd), so the
+        cost scales with k_max instead of min(m,n). The energy outside the
+        partial factors is kept per channel, which keeps compute_error exact
+        for the stored factors:
+        
+            ||A - A_k||_F² = ||A||_F² - Σᵢ₌₁ᵏ σᵢ²
+        
+        Args:
+            data: Image array of shape (m, n, channels) or (m, n)
+            k_max: Number of singular triplets to compute (None = all)
+            oversampling: Extra sketch columns for the randomized method
+            power_iterations: Number of power iterations for the randomized method
+            seed: Seed of the Gaussian test matrix
         """
         self.U_list = []
         self.S_list = []
         self.V_list = []
-        
-        n_channels = data.shape[2] if len(data.shape) == 3 else 1
-        
-        for i in range(n_channels):
-            channel = data[:, :, i] if n_channels > 1 else data
-            U, s, Vt = np.linalg.svd(channel, full_matrices=False)
+        self.tail_sq = []
+        self._accumulator = None
+        self._preview_accumulator = None
+        
+        self.dtype = self._working_dtype(data)
+        data = np.asarray(data, dtype=self.dtype)
+        # A 2D matrix is decomposed as a single channel; like a grayscale
+        # image from load_image it is reconstructed without channel axis
+        if data.ndim == 2:
+            data = data[:, :, np.newaxis]
+        self.original_shape = data.shape
+        self.is_grayscale = data.shape[2] == 1
+        
+        self.color_matrix = None
+        if data.shape[2] == 3:
+            self.color_matrix = color_matrix(self.color_space, data)
+        if self.color_matrix is not None:
+            data = data @ self.color_matrix.T.astype(self.dtype)
+        
+        n_channels = data.shape[2]
+        full_rank = min(data.shape[0], data.shape[1])
+        partial = k_max is not None and k_max + oversampling < full_rank
+        
+        cache_key = None
+        if self.cache is not None:
+            settings = {'k_max': k_max, 'color_space': self.color_space}
+            if partial:
+                settings.update(oversampling=oversampling,
+                                power_iterations=power_iterations, seed=seed)
+            cache_key = self.cache.key(data, settings)
+            cached = self.cache.lookup(cache_key)
+            if cached is not None:
+                self.load_factors(cached)
+                return
+        
+        # One contiguous copy, channel-major: stack[c] is a C-contiguous matrix
+        stack = np.ascontiguousarray(np.moveaxis(data, 2, 0))
+        
+        def decompose(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            if partial:
+                return randomized_svd(A, k_max, oversampling, power_iterations, seed)
+            return np.linalg.svd(A, full_matrices=False)
+        
+        if self.execution == 'stacked':
+            U_all, s_all, Vt_all = decompose(stack)
+            factors = list(zip(U_all, s_all, Vt_all))
+        elif self.execution == 'threads':
+            workers, blas_threads = self._thread_split(n_channels)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                if threadpool_limits is not None:
+                    with threadpool_limits(limits=blas_threads, user_api='blas'):
+                        factors = list(pool.map(decompose, stack))
+                else:
+                    factors = list(pool.map(decompose, stack))
+        else:
+            factors = [decompose(A) for A in stack]
+        
+        for A, (U, s, Vt) in zip(stack, factors):
+            if partial:
+                tail = max(squared_norm(A) - squared_norm(s), 0.0)
+            else:
+                tail = 0.0
+                if k_max is not None:
+                    tail = squared_norm(s[k_max:])
+                    U, s, Vt = U[:, :k_max], s[:k_max], Vt[:k_max, :]
+                
             self.U_list.append(U)
             self.S_list.append(s)
             self.V_list.append(Vt)
+            self.tail_sq.append(tail)
+            
+        self._build_energy_index()
+        self.accuracy_report = self._build_accuracy_report(
+            k_max, oversampling, power_iterations, partial
+        )
+        
+        if cache_key is not None:
+            self.cache.store(cache_key, lambda path: self._write_factors(
+                path, self.get_max_rank(), self.dtype.name,
+                {'accuracy_report': self.accuracy_report}
+            ))
+    
+    def _thread_split(self, n_channels: int) -> Tuple[int, int]:
+        """(worker threads, BLAS threads per worker) for execution='threads'."""
+        if self.thread_split is not None:
+            workers, blas_threads = self.thread_split
+            return max(1, workers), max(1, blas_threads)
+        cores = os.cpu_count() or 1
+        workers = max(1, min(n_channels, cores))
+        return workers, max(1, cores // workers)
     
-    def reconstruct(self, k: int) -> np.ndarray:
+    def _build_energy_index(self) -> None:
         """
-        Reconstruct image using rank-k approximation.
+        Precompute the error energy of every rank once.
+        
+        tail_energy[c][k] = tail_sq[c] + Σᵢ₌ₖ₊₁ʳ σᵢ² is a reverse cumulative
+        sum, which avoids the cancellation of ||A||² - Σᵢ₌₁ᵏ σᵢ² for
+        small errors. Afterwards all error and energy lookups are O(1).
+        """
+        self.tail_energy = []
+        for s, tail in zip(self.S_list, self.tail_sq):
+            energy = np.zeros(len(s) + 1)
+            energy[:-1] = np.cumsum(np.square(s[::-1], dtype=np.float64))[::-1]
+            self.tail_energy.append(energy + tail)
+    
+    def _build_accuracy_report(
+        self,
+        k_max: Optional[int],
+        oversampling: int,
+        power_iterations: int,
+        partial: bool,
+    ) -> Dict[str, object]:
+        """
+        Summarize how much of the image energy the stored factors capture.
+        
+        The residual norm is exact for the computed factors; for the
+        randomized method it is an upper bound of the optimal rank-k_max
+        error σₖ₊₁² + ... + σᵣ² guaranteed by Eckart-Young-Mirsky.
+        """
+        captured = [squared_norm(s) for s in self.S_list]
+        total = [c + t for c, t in zip(captured, self.tail_sq)]
+        residual = float(np.sqrt(sum(self.tail_sq)))
+        total_norm = float(np.sqrt(sum(total)))
+        
+        return {
+            'method': 'randomized' if partial else 'full',
+            'k_max': self.get_max_rank() if self.S_list else 0,
+            'oversampling': oversampling if partial else 0,
+            'power_iterations': power_iterations if partial else 0,
+            'captured_energy': [
+                c / t if t > 0 else 1.0 for c, t in zip(captured, total)
+            ],
+            'residual_norm': residual,
+            'relative_residual': residual / total_norm if total_norm > 0 else 0.0,
+        }
+    
+    def get_accuracy_report(self) -> Optional[Dict[str, object]]:
+        """Return the accuracy report of the last compute_svd call."""
+        return self.accuracy_report
+    
+    def reconstruct(self, k: Ranks) -> np.ndarray:
+        """
+        Reconstruct image using rank-k approximation (k may be per channel).
         
         A_k = U_k @ Σ_k @ V_k^T
         
         where U_k, V_k contain the first k columns/rows and Σ_k is k×k diagonal.
+        
+        Consecutive calls reuse the previous reconstruction (see
+        RankAccumulator), so changing k by Δ costs O(Δ·m·n).
+        """
+        if self._accumulator is None:
+            self._accumulator = RankAccumulator(self.U_list, self.S_list, self.V_list)
+        channels = self._accumulator.update(k)
+        
+        return self._to_image(channels)
+    
+    def prepare_preview(self, max_size: Tuple[int, int] = (400, 400)) -> Tuple[int, int]:
         """
-        channels = []
+        Downsample the factors once to display resolution.
         
-        for U, s, Vt in zip(self.U_list, self.S_list, self.V_list):
-            # Rank-k approximation: A_k = U[:,:k] @ diag(s[:k]) @ V[:k,:]
-            reconstructed = (U[:, :k] @ np.diag(s[:k])) @ Vt[:k, :]
-            channels.append(reconstructed)
+        The rows of U and the columns of Vt are area-averaged to the size
+        that Image.thumbnail(max_size) would produce, so reconstruct_preview
+        works on matrices of at most max_size pixels:
         
+            (R A Cᵀ)_k = (R U_k) Σ_k (Vt_k Cᵀ)
+        
+        Returns:
+            Preview size as (width, height)
+        """
+        self.preview_size = max_size
+        m, n = self.U_list[0].shape[0], self.V_list[0].shape[1]
+        scale = min(max_size[0] / n, max_size[1] / m, 1.0)
+        m_out = max(1, round(m * scale))
+        n_out = max(1, round(n * scale))
+        
+        dtype = self.U_list[0].dtype
+        R = area_resample_matrix(m, m_out, dtype)
+        C = area_resample_matrix(n, n_out, dtype)
+        
+        self._preview_accumulator = RankAccumulator(
+            [R @ U for U in self.U_list],
+            self.S_list,
+            [Vt @ C.T for Vt in self.V_list],
+        )
+        return n_out, m_out
+    
+    def reconstruct_preview(self, k: Ranks) -> np.ndarray:
+        """
+        Reconstruct the rank-k approximation at display resolution.
+        
+        Cost is O(k·m'·n') for the preview size m'×n' instead of O(k·m·n);
+        use reconstruct for the full-resolution export.
+        """
+        if self._preview_accumulator is None:
+            self.prepare_preview(self.preview_size)
+        channels = self._preview_accumulator.update(k)
+        
+        return self._to_image(channels)
+    
+    def _to_image(self, channels: List[np.ndarray]) -> np.ndarray:
+        """Stack channel reconstructions into a uint8 image."""
         # Stack channels and clip to valid range [0, 255]
-        result = np.stack(channels, axis=2) if len(channels) > 1 else channels[0]
+        result = np.stack(channels, axis=2)
+        if self.color_matrix is not None:
+            result = result @ self.color_matrix.astype(result.dtype)
         result = np.clip(result, 0, 255).astype(np.uint8)
         
         if self.is_grayscale:
@@ -100,27 +585,49 @@ class SVDCompressor:
             
         return result
     
-    def compute_error(self, k: int) -> float:
+    def _channel_ranks(self, k: Ranks) -> List[int]:
+        """Expand k to one rank per channel, clipped to the available ranks."""
+        ranks = [k] * len(self.S_list) if np.isscalar(k) else list(k)
+        return [max(0, min(int(kc), len(s))) for kc, s in zip(ranks, self.S_list)]
+    
+    def compute_error(self, k: Ranks) -> float:
         """
         Compute Frobenius norm of approximation error.
         
         ||A - A_k||_F = sqrt(Σᵢ₌ₖ₊₁ʳ σᵢ²)
         
-        This is computed efficiently from discarded singular values.
+        This is looked up in O(1) from the precomputed tail energies. For
+        partial factors the energy outside the computed triplets (tail_sq)
+        is included, which gives the exact error of the stored approximation.
         """
         total_error_sq = 0.0
         
-        for s in self.S_list:
-            if k < len(s):
-                total_error_sq += np.sum(s[k:]**2)
+        for energy, kc in zip(self.tail_energy, self._channel_ranks(k)):
+            total_error_sq += energy[kc]
                 
         return np.sqrt(total_error_sq)
     
-    def compute_compression_size(self, k: int) -> Tuple[float, float]:
+    def retained_energy(self, k: Ranks) -> float:
+        """Fraction of ||A||_F² captured by the rank-k approximation."""
+        error_sq = 0.0
+        for energy, kc in zip(self.tail_energy, self._channel_ranks(k)):
+            error_sq += energy[kc]
+        total = sum(energy[0] for energy in self.tail_energy)
+        # Without sqrt/square round trip, like rank_for_energy
+        return float(self._retained(error_sq, total))
+    
+    def compute_compression_size(self, k: Ranks, encoding: Optional[str] = None) -> Tuple[float, float]:
         """
         Calculate storage requirements for rank-k approximation.
         
-        Storage = k(m + n + 1) × 8 bytes per channel (64-bit floats)
+        Storage ≈ k(m + n + 1) × bytes per value per channel, reported as
+        the exact size of the factor file written by save_factors (arrays,
+        alignment padding, header and index) for the given encoding.
+        
+        Args:
+            k: Rank of the approximation (or one rank per channel)
+            encoding: Encoding of the singular vectors (see svd_storage.ENCODINGS),
+                defaults to the working precision
         
         Returns:
             Tuple of (compressed size in KB, percentage of original)
@@ -132,8 +639,7 @@ class SVDCompressor:
         n_channels = self.original_shape[2] if len(self.original_shape) == 3 else 1
         
         # Storage: k columns of U (m×k) + k singular values + k rows of V (k×n)
-        compressed_elements = k * (m + n + 1) * n_channels
-        compressed_bytes = compressed_elements * 8  # 64-bit floats
+        compressed_bytes = self._write_factors(None, k, encoding)
         
         original_bytes = m * n * n_channels
         
@@ -142,175 +648,280 @@ class SVDCompressor:
         
         return compressed_kb, percentage
     
-    def get_max_rank(self) -> int:
-        """Return maximum possible rank (min of image dimensions)."""
-        if self.original_shape is None:
-            return 1
-        return min(self.original_shape[0], self.original_shape[1])
-    
-    def get_singular_values(self, channel: int = 0) -> np.ndarray:
-        """Return singular values for specified channel."""
-        if channel < len(self.S_list):
-            return self.S_list[channel]
-        return np.array([])
-
-
-class SVDCompressorGUI:
-    """
-    Tkinter GUI for interactive SVD image compression.
-    
-    Features:
-    - Load any image (JPG, PNG, etc.)
-    - Real-time rank adjustment via slider
-    - Display of approximation error and compression ratio
-    - Side-by-side comparison of original and compressed images
-    """
-    
-    def __init__(self, root: tk.Tk):
-        self.root = root
-        self.root.title("SVD Bildkompressor")
-        self.root.geometry("900x700")
+    def save_factors(self, filepath: str, k: Ranks, encoding: Optional[str] = None) -> int:
+        """
+        Save the rank-k factors of all channels to a factor file.
         
-        self.compressor = SVDCompressor()
-        self.original_image: Optional[Image.Image] = None
-        self.current_k = 20
+        Args:
+            filepath: Output path (conventionally *.svdf)
+            k: Rank to store (or one rank per channel)
+            encoding: 'float64', 'float32', 'float16' or 'uint8'
+                (default: working precision)
         
-        self._setup_ui()
+        Returns:
+            Number of bytes written
+        """
+        return self._write_factors(filepath, k, encoding)
+    
+    def _write_factors(
+        self,
+        filepath: Optional[str],
+        k: Ranks,
+        encoding: Optional[str],
+        metadata: Optional[Dict[str, object]] = None,
+    ) -> int:
+        """Write the rank-k factors, or only account the size if filepath is None."""
+        encoding = encoding or self.dtype.name
+        if self.color_matrix is not None:
+            metadata = dict(metadata or {}, color_matrix=self.color_matrix.tolist())
+        writer = FactorWriter(filepath, self.original_shape, encoding, self.is_grayscale, metadata)
+        m, n = self.original_shape[0], self.original_shape[1]
         
-    def _setup_ui(self):
-        """Initialize all UI components."""
-        # Main frame
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky="nsew")
+        if not self.S_list:
+            # Size estimate before compute_svd
+            kc = max(0, min(int(k), self.get_max_rank()))
+            for c in range(self.original_shape[2]):
+                writer.add_block(c, (0, 0), None, None, None, shape=(m, n, kc))
+            return writer.close()
+        
+        for c, kc in enumerate(self._channel_ranks(k)):
+            U, s, Vt = self.U_list[c], self.S_list[c], self.V_list[c]
+            tail = self.tail_energy[c][kc]
+            if filepath is None:
+                writer.add_block(c, (0, 0), None, None, None, tail, shape=(m, n, kc))
+            else:
+                writer.add_block(c, (0, 0), U[:, :kc], s[:kc], Vt[:kc, :], tail)
+        return writer.close()
+    
+    def error_curve(self, encoding: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """
+        Rate-distortion curve over all ranks k = 0, ..., max rank.
         
-        # Load button
-        self.load_btn = ttk.Button(
-            main_frame, 
-            text="Bild einlesen", 
-            command=self._load_image
-        )
-        self.load_btn.grid(row=0, column=0, columnspan=2, pady=10)
-        
-        # Image labels
-        ttk.Label(main_frame, text="Originalbild").grid(row=1, column=0)
-        ttk.Label(main_frame, text="Komprimiert").grid(row=1, column=1)
-        
-        # Image display canvases
-        self.original_canvas = tk.Canvas(main_frame, width=400, height=400, bg='gray')
-        self.original_canvas.grid(row=2, column=0, padx=5, pady=5)
-        
-        self.compressed_canvas = tk.Canvas(main_frame, width=400, height=400, bg='gray')
-        self.compressed_canvas.grid(row=2, column=1, padx=5, pady=5)
-        
-        # Rank slider
-        self.rank_var = tk.IntVar(value=20)
-        self.rank_slider = ttk.Scale(
-            main_frame,
-            from_=1,
-            to=100,
-            variable=self.rank_var,
-            orient='horizontal',
-            command=self._on_slider_change
-        )
-        self.rank_slider.grid(row=3, column=0, columnspan=2, sticky='ew', pady=10)
-        
-        # Rank label
-        self.rank_label = ttk.Label(main_frame, text="Rang k: 20")
-        self.rank_label.grid(row=4, column=0, columnspan=2)
-        
-        # Error display
-        self.error_label = ttk.Label(main_frame, text="Approximationsfehler (F-Norm): -")
-        self.error_label.grid(row=5, column=0, columnspan=2)
-        
-        # Size display
-        self.size_label = ttk.Label(main_frame, text="Größe (SVD-Daten): -")
-        self.size_label.grid(row=6, column=0, columnspan=2)
-        
-        # Configure grid weights
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        
-    def _load_image(self):
-        """Handle image loading via file dialog."""
-        filepath = filedialog.askopenfilename(
-            title="Bild auswählen",
-            filetypes=[
-                ("Bilder", "*.jpg *.jpeg *.png *.bmp *.gif"),
-                ("Alle Dateien", "*.*")
+        Returns:
+            Dict of arrays 'rank', 'error', 'relative_error',
+            'retained_energy' and 'bytes' (factor file size for encoding)
+        """
+        ranks = np.arange(self.get_max_rank() + 1)
+        error_sq = sum(energy[ranks] for energy in self.tail_energy)
+        total = error_sq[0]
+        
+        return {
+            'rank': ranks,
+            'error': np.sqrt(error_sq),
+            'relative_error': np.sqrt(error_sq / total) if total > 0 else np.zeros(len(ranks)),
+            'retained_energy': self._retained(error_sq, total),
+            'bytes': np.array([self._write_factors(None, int(k), encoding) for k in ranks]),
+        }
+    
+    @staticmethod
+    def _retained(error_sq, total):
+        """1 - error_sq / total (1 for an all-zero image); scalar or array."""
+        if total == 0:
+            return np.ones_like(error_sq, dtype=np.float64)
+        return 1.0 - np.asarray(error_sq) / total
+    
+    @staticmethod
+    def _smallest_rank(energy: np.ndarray, budget: float) -> int:
+        """Smallest k with energy[k] ≤ budget for a non-increasing energy array."""
+        # energy[::-1] is sorted ascending: binary search
+        count = np.searchsorted(energy[::-1], budget, side='right')
+        return int(min(len(energy) - count, len(energy) - 1))
+    
+    def rank_for_error(self, max_error: float, per_channel: bool = False) -> Ranks:
+        """
+        Minimal rank with ||A - A_k||_F ≤ max_error (binary search).
+        
+        With per_channel=True every channel gets its own minimal rank with
+        ||A_c - A_c,k||_F ≤ max_error. If the target cannot be reached, the
+        maximum available rank is returned.
+        """
+        # Compared as errors, not energies: max_error**2 may round below
+        # compute_error(k)**2 and select k + 1 for max_error = compute_error(k)
+        if per_channel:
+            return [self._smallest_rank(np.sqrt(energy), max_error) for energy in self.tail_energy]
+        ranks = np.arange(self.get_max_rank() + 1)
+        total = sum(energy[ranks] for energy in self.tail_energy)
+        return self._smallest_rank(np.sqrt(total), max_error)
+    
+    def rank_for_energy(self, fraction: float, per_channel: bool = False) -> Ranks:
+        """
+        Minimal rank that retains at least the given fraction of ||A||_F²
+        (globally or per channel).
+        """
+        # Compared on the retained fraction itself (same expression as
+        # retained_energy), so that fraction = retained_energy(k) selects k.
+        # The retained fraction is non-decreasing, its negative non-increasing.
+        if per_channel:
+            return [
+                self._smallest_rank(-self._retained(energy, energy[0]), -fraction)
+                for energy in self.tail_energy
             ]
-        )
+        ranks = np.arange(self.get_max_rank() + 1)
+        total = sum(energy[ranks] for energy in self.tail_energy)
+        return self._smallest_rank(-self._retained(total, total[0]), -fraction)
+    
+    def allocate_ranks(self, max_error: float) -> List[int]:
+        """
+        Per-channel ranks with ||A - A_k||_F ≤ max_error and the fewest bytes.
         
-        if not filepath:
-            return
-            
-        # Load and process image
-        data = self.compressor.load_image(filepath)
-        self.compressor.compute_svd(data)
+        Greedy marginal-gain selection over the prefix energies: the next
+        rank of channel c removes σ_c,k² = tail_energy[c][k] - tail_energy[c][k+1]
+        error energy, and every stored triplet costs the same number of bytes
+        (all channels have the same m×n), so the term with the largest σ² is
+        taken until the remaining energy fits the budget. Since σ_c,k² is
+        non-increasing in k, this is one global sort over all channels, and
+        the greedy choice needs the fewest triplets, i.e. bytes.
         
-        # Store original for display
-        self.original_image = Image.open(filepath).convert('RGB')
+        If the target cannot be reached, all available ranks are returned.
+        """
+        gains = [energy[:-1] - energy[1:] for energy in self.tail_energy]
+        channels = np.concatenate([np.full(len(g), c) for c, g in enumerate(gains)])
+        gain = np.concatenate(gains)
+        order = np.argsort(-gain, kind='stable')
+        
+        # error[j] = ||A - A_k||_F after the first j + 1 terms (non-increasing),
+        # summed like compute_error so that max_error = compute_error(ranks)
+        # reproduces the ranks
+        taken = channels[order]
+        prefix_ranks = np.cumsum(
+            taken[np.newaxis, :] == np.arange(len(self.tail_energy))[:, np.newaxis], axis=1
+        )
+        error = np.sqrt(sum(energy[k] for energy, k in zip(self.tail_energy, prefix_ranks)))
+        if self.compute_error(0) <= max_error:
+            count = 0
+        else:
+            count = int(np.searchsorted(-error, -max_error, side='left')) + 1
         
-        # Update slider range
-        max_rank = self.compressor.get_max_rank()
-        self.rank_slider.configure(to=max_rank)
+        taken = channels[order[:min(count, len(order))]]
+        return np.bincount(taken, minlength=len(self.S_list)).tolist()
+    
+    def rank_for_size(self, max_bytes: int, encoding: Optional[str] = None) -> int:
+        """
+        Maximal rank whose factor file fits into max_bytes (binary search).
         
-        # Display images
-        self._display_original()
-        self._update_compressed()
+        Returns 0 if not even the rank-0 file fits.
+        """
+        lo, hi = 0, self.get_max_rank()
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._write_factors(None, mid, encoding) <= max_bytes:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+    
+    def load_factors(self, filepath: str) -> None:
+        """
+        Load factors written by save_factors instead of computing an SVD.
         
-    def _display_original(self):
-        """Display the original image on canvas."""
-        if self.original_image is None:
-            return
-            
-        # Resize for display
-        display_img = self.original_image.copy()
-        display_img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-        
-        self.original_photo = ImageTk.PhotoImage(display_img)
-        self.original_canvas.delete("all")
-        self.original_canvas.create_image(200, 200, image=self.original_photo)
-        
-    def _update_compressed(self):
-        """Update compressed image display based on current k."""
-        if not self.compressor.S_list:
-            return
-            
-        k = self.rank_var.get()
+        The file is memory-mapped; float64/float32 factors are used directly
+        from the mapping without copying.
+        """
+        factor_file = FactorFile(filepath)
+        n_channels = factor_file.image_shape[2]
+        if len(factor_file.blocks) != n_channels:
+            raise ValueError(f"{filepath} contains tiled factors, use FactorFile.reconstruct")
+        
+        self.U_list, self.S_list, self.V_list, self.tail_sq = [], [], [], []
+        for i, block in enumerate(factor_file.blocks):
+            U, s, Vt = factor_file.block_factors(i)
+            self.U_list.append(U)
+            self.S_list.append(s)
+            self.V_list.append(Vt)
+            self.tail_sq.append(block['tail_sq'])
+        
+        self.original_shape = factor_file.image_shape
+        self.is_grayscale = factor_file.is_grayscale
+        self.dtype = np.result_type(self.U_list[0], self.S_list[0])
+        self.accuracy_report = factor_file.metadata.get('accuracy_report')
+        color = factor_file.metadata.get('color_matrix')
+        self.color_matrix = np.array(color) if color is not None else None
+        self._build_energy_index()
+        self._accumulator = None
+        self._preview_accumulator = None
+    
+    def get_max_rank(self) -> int:
+        """
+        Return maximum available rank.
         
-        # Reconstruct image
-        reconstructed = self.compressor.reconstruct(k)
-        compressed_img = Image.fromarray(reconstructed)
+        This is min(m, n) for a full SVD and k_max for partial factors.
+        """
+        if self.S_list:
+            return min(len(s) for s in self.S_list)
+        if self.original_shape is None:
+            return 1
+        return min(self.original_shape[0], self.original_shape[1])
+    
+    def get_singular_values(self, channel: int = 0) -> np.ndarray:
+        """Return singular values for specified channel."""
+        if channel < len(self.S_list):
+            return self.S_list[channel]
+        return np.array([])
+    
+    def check_precision(
+        self,
+        data: np.ndarray,
+        ranks: Optional[List[int]] = None,
+        rtol: float = 1e-4,
+    ) -> Dict[str, object]:
+        """
+        Compare rank-k errors of the current factors with float64 SVD errors.
         
-        # Resize for display
-        compressed_img.thumbnail((400, 400), Image.Resampling.LANCZOS)
+        Singular values computed in precision u are perturbed by at most
+        about u·||A||₂ (Weyl), so with float32 factors the rank-k errors
+        should agree with the float64 errors up to a small multiple of
+        ε₃₂·sqrt(r)·||A||_F. The check passes if
         
-        self.compressed_photo = ImageTk.PhotoImage(compressed_img)
-        self.compressed_canvas.delete("all")
-        self.compressed_canvas.create_image(200, 200, image=self.compressed_photo)
+            |e(k) - e₆₄(k)| ≤ rtol · ||A||_F    for all tested k
         
-        # Update labels
-        error = self.compressor.compute_error(k)
-        size_kb, percentage = self.compressor.compute_compression_size(k)
+        For partial factors (compute_svd with k_max) the deviation also
+        contains the approximation error of the randomized method.
         
-        self.rank_label.configure(text=f"Rang k: {k}")
-        self.error_label.configure(text=f"Approximationsfehler (F-Norm): {error:.2f}")
-        self.size_label.configure(
-            text=f"Größe (SVD-Daten): {size_kb:.1f} KB ({percentage:.1f}% vom Original)"
-        )
+        Args:
+            data: Image array the factors were computed from
+            ranks: Ranks to compare (default: 10 ranks spread over max rank)
+            rtol: Tolerance relative to ||A||_F
         
-    def _on_slider_change(self, event=None):
-        """Handle slider value changes."""
-        self._update_compressed()
+        Returns:
+            Dict with the tested ranks, both error curves, the largest
+            relative deviation and whether it is within rtol
+        """
+        data = np.asarray(data, dtype=np.float64)
+        if data.ndim == 2:
+            data = data[:, :, np.newaxis]
+        if self.color_matrix is not None:
+            data = data @ self.color_matrix.T
+        
+        reference = [
+            np.linalg.svd(data[:, :, c], compute_uv=False)
+            for c in range(data.shape[2])
+        ]
+        if ranks is None:
+            ranks = np.unique(np.linspace(1, self.get_max_rank(), 10).astype(int)).tolist()
+        
+        norm = np.sqrt(sum(squared_norm(s) for s in reference))
+        errors = [float(self.compute_error(k)) for k in ranks]
+        errors_64 = [
+            float(np.sqrt(sum(squared_norm(s[k:]) for s in reference)))
+            for k in ranks
+        ]
+        deviation = max(abs(e - e64) for e, e64 in zip(errors, errors_64)) / norm if norm > 0 else 0.0
+        
+        return {
+            'dtype': self.dtype.name,
+            'ranks': ranks,
+            'errors': errors,
+            'errors_float64': errors_64,
+            'max_relative_deviation': deviation,
+            'rtol': rtol,
+            'passed': deviation <= rtol,
+        }
 
 
 def main():
-    """Entry point for the SVD compressor application."""
-    root = tk.Tk()
-    app = SVDCompressorGUI(root)
-    root.mainloop()
+    """Entry point for the SVD compressor application (starts the GUI)."""
+    from svd_gui import main as gui_main
+    gui_main()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,409 @@
+"""
+SVD Image Compressor GUI
+========================
+Interactive Tkinter front end for the SVDCompressor.
+
+Authors: Maximilian Bazlov, Emmanuel Nana Nana
+Course: B-AMP3 - Seminar zu Simulationstools
+Institution: Technische Hochschule Nürnberg Georg Simon Ohm
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageTk
+import tkinter as tk
+from tkinter import filedialog, ttk
+from typing import Tuple, Optional, Dict
+
+from svd_cache import FactorCache
+from svd_compressor import SVDCompressor
+from svd_storage import ENCODINGS
+
+
+class SVDCompressorGUI:
+    """
+    Tkinter GUI for interactive SVD image compression.
+    
+    Features:
+    - Load any image (JPG, PNG, etc.)
+    - Real-time rank adjustment via slider
+    - Display of approximation error and compression ratio
+    - Side-by-side comparison of original and compressed images
+    
+    All SVD work (loading, preview reconstruction, export) runs on a single
+    worker thread, so the Tk main loop never blocks. Slider events are
+    debounced, and each new request supersedes the queued ones: a task whose
+    generation is outdated when the worker picks it up is dropped. Loads and
+    exports are never dropped, and preview requests are ignored while a load
+    is pending (the preview follows the load). Results
+    are handed back through a queue that the main thread polls with
+    root.after, because Tk widgets must only be touched from the main thread.
+    """
+    
+    # Delay between the last slider event and the preview request (ms)
+    DEBOUNCE_MS = 15
+    # Polling interval of the result queue (ms)
+    POLL_MS = 20
+    
+    def __init__(self, root: tk.Tk):
+        self.root = root
+        self.root.title("SVD Bildkompressor")
+        self.root.geometry("900x700")
+        
+        # Reopening an image loads its factors from the on-disk cache
+        self.compressor = SVDCompressor(cache=FactorCache())
+        self.original_image: Optional[Image.Image] = None
+        self.current_k = 20
+        
+        # Worker pipeline: one thread owns the compressor state
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._results: "queue.Queue[Tuple[int, str, object]]" = queue.Queue()
+        self._generation = 0
+        self._shown_generation = 0
+        self._pending_tasks = 0
+        self._loading = False
+        self._debounce_id: Optional[str] = None
+        
+        self._setup_ui()
+        
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(self.POLL_MS, self._poll_results)
+        
+    def _setup_ui(self):
+        """Initialize all UI components."""
+        # Main frame
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky="nsew")
+        
+        # Load button
+        self.load_btn = ttk.Button(
+            main_frame, 
+            text="Bild einlesen", 
+            command=self._load_image
+        )
+        self.load_btn.grid(row=0, column=0, pady=10)
+        
+        # Export button (full-resolution reconstruction)
+        self.export_btn = ttk.Button(
+            main_frame,
+            text="Exportieren",
+            command=self._export_image,
+            state='disabled'
+        )
+        self.export_btn.grid(row=0, column=1, pady=10)
+        
+        # Image labels
+        ttk.Label(main_frame, text="Originalbild").grid(row=1, column=0)
+        ttk.Label(main_frame, text="Komprimiert").grid(row=1, column=1)
+        
+        # Image display canvases
+        self.original_canvas = tk.Canvas(main_frame, width=400, height=400, bg='gray')
+        self.original_canvas.grid(row=2, column=0, padx=5, pady=5)
+        
+        self.compressed_canvas = tk.Canvas(main_frame, width=400, height=400, bg='gray')
+        self.compressed_canvas.grid(row=2, column=1, padx=5, pady=5)
+        
+        # Rank slider
+        self.rank_var = tk.IntVar(value=20)
+        self.rank_slider = ttk.Scale(
+            main_frame,
+            from_=1,
+            to=100,
+            variable=self.rank_var,
+            orient='horizontal',
+            command=self._on_slider_change
+        )
+        self.rank_slider.grid(row=3, column=0, columnspan=2, sticky='ew', pady=10)
+        
+        # Rank label
+        self.rank_label = ttk.Label(main_frame, text="Rang k: 20")
+        self.rank_label.grid(row=4, column=0, columnspan=2)
+        
+        # Error display
+        self.error_label = ttk.Label(main_frame, text="Approximationsfehler (F-Norm): -")
+        self.error_label.grid(row=5, column=0, columnspan=2)
+        
+        # Encoding selection (size report and saved factors)
+        encoding_frame = ttk.Frame(main_frame)
+        encoding_frame.grid(row=6, column=0, columnspan=2)
+        ttk.Label(encoding_frame, text="Kodierung:").pack(side='left')
+        self.encoding_var = tk.StringVar(value='float32')
+        self.encoding_box = ttk.Combobox(
+            encoding_frame,
+            textvariable=self.encoding_var,
+            values=ENCODINGS,
+            state='readonly',
+            width=8
+        )
+        self.encoding_box.pack(side='left', padx=5)
+        self.encoding_box.bind('<<ComboboxSelected>>', lambda event: self._update_compressed())
+        
+        # Size display
+        self.size_label = ttk.Label(main_frame, text="Größe (SVD-Daten): -")
+        self.size_label.grid(row=7, column=0, columnspan=2)
+        
+        # Status display ("computing..." indicator)
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.grid(row=8, column=0, columnspan=2)
+        
+        # Configure grid weights
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
+        
+    # ------------------------------------------------------------------
+    # Worker pipeline
+    # ------------------------------------------------------------------
+    
+    def _submit(self, kind: str, func, *args, supersede: bool = True):
+        """
+        Queue func(*args) on the worker thread.
+        
+        With supersede=True the task gets a new generation and all queued
+        superseding tasks with an older generation are skipped by the worker.
+        """
+        if supersede:
+            self._generation += 1
+        generation = self._generation
+        
+        self._pending_tasks += 1
+        self._update_status()
+        self._executor.submit(self._run_task, generation, kind, func, args, supersede)
+        
+    def _run_task(self, generation: int, kind: str, func, args, supersede: bool):
+        """Execute a task on the worker thread and post its result."""
+        if supersede and generation != self._generation:
+            self._results.put((generation, 'skipped', kind))
+            return
+        try:
+            result = func(*args)
+        except Exception as exc:  # reported in the status line
+            self._results.put((generation, 'error', exc))
+            return
+        self._results.put((generation, kind, result))
+        
+    def _poll_results(self):
+        """Apply finished worker results on the main thread."""
+        latest: Dict[str, Tuple[int, object]] = {}
+        
+        try:
+            while True:
+                generation, kind, result = self._results.get_nowait()
+                self._pending_tasks -= 1
+                if kind == 'error':
+                    self._show_error(result)
+                elif kind == 'skipped':
+                    if result == 'loaded':
+                        self._enable_controls()
+                else:
+                    # Keep only the newest frame of each kind
+                    latest[kind] = (generation, result)
+        except queue.Empty:
+            pass
+        
+        if 'loaded' in latest:
+            self._show_loaded(*latest['loaded'])
+        if 'preview' in latest:
+            self._show_preview(*latest['preview'])
+        if 'exported' in latest:
+            self.export_btn.configure(state='normal')
+            
+        self._update_status()
+        self.root.after(self.POLL_MS, self._poll_results)
+        
+    def _show_error(self, exc: Exception):
+        """Report a failed task and re-enable the controls."""
+        self.status_label.configure(text=f"Fehler: {exc}")
+        self._enable_controls()
+        
+    def _enable_controls(self):
+        """Re-enable the controls disabled while a load is pending."""
+        self._loading = False
+        self.load_btn.configure(state='normal')
+        self.rank_slider.state(['!disabled'])
+        if self.compressor.S_list:
+            self.export_btn.configure(state='normal')
+            
+    def _update_status(self):
+        """Show the "computing..." indicator while tasks are pending."""
+        if self._pending_tasks > 0:
+            self.status_label.configure(text="Berechne…")
+        elif self.status_label.cget('text') == "Berechne…":
+            self.status_label.configure(text="")
+            
+    def _on_close(self):
+        """Stop the worker and close the window."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
+        
+    # ------------------------------------------------------------------
+    # Tasks (worker thread)
+    # ------------------------------------------------------------------
+    
+    def _compute_load(self, filepath: str, k: int, encoding: str) -> Dict[str, object]:
+        """Load the image, compute its SVD and the first preview."""
+        data = self.compressor.load_image(filepath)
+        self.compressor.compute_svd(data)
+        self.compressor.prepare_preview((400, 400))
+        
+        # Original for display
+        original = Image.open(filepath).convert('RGB')
+        original.thumbnail((400, 400), Image.Resampling.LANCZOS)
+        
+        result = self._compute_preview(k, encoding)
+        result['original'] = original
+        result['max_rank'] = self.compressor.get_max_rank()
+        return result
+        
+    def _compute_preview(self, k: int, encoding: str) -> Dict[str, object]:
+        """Reconstruct the preview frame and metrics for rank k."""
+        k = min(k, self.compressor.get_max_rank())
+        size_kb, percentage = self.compressor.compute_compression_size(k, encoding)
+        return {
+            'k': k,
+            'encoding': encoding,
+            'frame': self.compressor.reconstruct_preview(k),
+            'error': self.compressor.compute_error(k),
+            'size_kb': size_kb,
+            'percentage': percentage,
+        }
+        
+    def _compute_export(self, filepath: str, k: int, encoding: str) -> str:
+        """Save the factors or the full-resolution reconstruction."""
+        if filepath.lower().endswith('.svdf'):
+            self.compressor.save_factors(filepath, k, encoding)
+        else:
+            Image.fromarray(self.compressor.reconstruct(k)).save(filepath)
+        return filepath
+        
+    # ------------------------------------------------------------------
+    # Event handlers and display (main thread)
+    # ------------------------------------------------------------------
+        
+    def _load_image(self):
+        """Handle image loading via file dialog."""
+        filepath = filedialog.askopenfilename(
+            title="Bild auswählen",
+            filetypes=[
+                ("Bilder", "*.jpg *.jpeg *.png *.bmp *.gif"),
+                ("Alle Dateien", "*.*")
+            ]
+        )
+        
+        if not filepath:
+            return
+            
+        # Load and process image in the background
+        self.load_btn.configure(state='disabled')
+        self.export_btn.configure(state='disabled')
+        self.rank_slider.state(['disabled'])
+        self._loading = True
+        self._submit(
+            'loaded', self._compute_load, filepath, self.rank_var.get(),
+            self.encoding_var.get(), supersede=False
+        )
+        
+    def _show_loaded(self, generation: int, result: Dict[str, object]):
+        """Display a freshly loaded image."""
+        self.original_image = result['original']
+        
+        # Update slider range
+        self.rank_slider.configure(to=result['max_rank'])
+        self._enable_controls()
+        
+        # Display images
+        self._display_original()
+        self._show_preview(generation, result)
+        
+        # Encoding changed while loading: those requests were ignored
+        if result['encoding'] != self.encoding_var.get():
+            self._update_compressed()
+        
+    def _display_original(self):
+        """Display the original image on canvas."""
+        if self.original_image is None:
+            return
+            
+        self.original_photo = ImageTk.PhotoImage(self.original_image)
+        self.original_canvas.delete("all")
+        self.original_canvas.create_image(200, 200, image=self.original_photo)
+        
+    def _update_compressed(self):
+        """Request a compressed image display for the current k."""
+        if self._loading or not self.compressor.S_list:
+            return
+            
+        k = self.rank_var.get()
+        self.rank_label.configure(text=f"Rang k: {k}")
+        self._submit('preview', self._compute_preview, k, self.encoding_var.get())
+        
+    def _show_preview(self, generation: int, result: Dict[str, object]):
+        """Display a finished preview frame unless a newer one is shown."""
+        if generation < self._shown_generation:
+            return
+        self._shown_generation = generation
+        
+        compressed_img = Image.fromarray(result['frame'])
+        
+        self.compressed_photo = ImageTk.PhotoImage(compressed_img)
+        self.compressed_canvas.delete("all")
+        self.compressed_canvas.create_image(200, 200, image=self.compressed_photo)
+        
+        # Update labels
+        self.rank_label.configure(text=f"Rang k: {result['k']}")
+        self.error_label.configure(
+            text=f"Approximationsfehler (F-Norm): {result['error']:.2f}"
+        )
+        self.size_label.configure(
+            text=f"Größe (SVD-Daten, {result['encoding']}): {result['size_kb']:.1f} KB "
+                 f"({result['percentage']:.1f}% vom Original)"
+        )
+        
+    def _export_image(self):
+        """Save the full-resolution rank-k reconstruction or its factors."""
+        if not self.compressor.S_list:
+            return
+            
+        filepath = filedialog.asksaveasfilename(
+            title="Komprimiertes Bild speichern",
+            defaultextension=".png",
+            filetypes=[
+                ("PNG", "*.png"),
+                ("JPEG", "*.jpg *.jpeg"),
+                ("SVD-Faktoren", "*.svdf"),
+                ("Alle Dateien", "*.*")
+            ]
+        )
+        
+        if not filepath:
+            return
+            
+        self.export_btn.configure(state='disabled')
+        self._submit(
+            'exported', self._compute_export, filepath, self.rank_var.get(),
+            self.encoding_var.get(), supersede=False
+        )
+        
+    def _on_slider_change(self, event=None):
+        """Handle slider value changes (debounced)."""
+        if self._debounce_id is not None:
+            self.root.after_cancel(self._debounce_id)
+        self._debounce_id = self.root.after(self.DEBOUNCE_MS, self._on_slider_settled)
+        
+    def _on_slider_settled(self):
+        """Request the preview once the slider events have settled."""
+        self._debounce_id = None
+        self._update_compressed()
+
+
+def main():
+    """Entry point for the SVD compressor application."""
+    root = tk.Tk()
+    app = SVDCompressorGUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Progressive SVD Streams
+=======================
+Streaming format for SVD-compressed images that can be displayed while it
+is still arriving.
+
+The rank-k approximation is a sum of rank-1 terms σᵢ uᵢ vᵢᵀ, and the terms
+with the largest σᵢ² carry most of the image energy. The writer therefore
+emits the triplets of all channels in one sequence ordered by descending
+σᵢ², so every prefix of the stream is the best available approximation for
+its length (the error after a prefix is the energy of the missing terms).
+
+Stream layout (little-endian):
+
+    magic b'SVDP', version (uint16), length of the JSON header (uint32)
+    JSON header: image shape, grayscale flag, encoding, color matrix
+    records: channel (uint8), σ (float32), [scale/offset of u and v,
+             4 × float32 for uint8], u (m values), v (n values)
+
+The reader is a generator that updates one float accumulator per channel in
+place and yields uint8 frames whenever the number of received bytes passes
+a checkpoint, e.g. after the first few KB for a coarse image.
+"""
+
+import json
+import struct
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from svd_storage import dequantize_rows, quantize_rows
+
+
+MAGIC = b'SVDP'
+VERSION = 1
+PREAMBLE = struct.Struct('<4sHI')
+
+STREAM_ENCODINGS = ('float32', 'float16', 'uint8')
+
+
+def _record_struct(encoding: str) -> struct.Struct:
+    """Fixed-size part of a record: channel, σ and quantization parameters."""
+    return struct.Struct('<Bf4f' if encoding == 'uint8' else '<Bf')
+
+
+def record_size(m: int, n: int, encoding: str) -> int:
+    """Size of one triplet record in bytes."""
+    return _record_struct(encoding).size + (m + n) * np.dtype(encoding).itemsize
+
+
+class ProgressiveWriter:
+    """
+    Write triplets (channel, σ, u, v) to a binary stream.
+
+    Use write_progressive to emit a compressor's factors in energy order.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        image_shape: Tuple[int, int, int],
+        is_grayscale: bool = False,
+        encoding: str = 'float16',
+        color_matrix: Optional[np.ndarray] = None,
+    ):
+        if encoding not in STREAM_ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}', expected one of {STREAM_ENCODINGS}")
+
+        self.stream = stream
+        self.encoding = encoding
+        self.record = _record_struct(encoding)
+
+        header = json.dumps({
+            'image_shape': list(image_shape),
+            'is_grayscale': is_grayscale,
+            'encoding': encoding,
+            'color_matrix': color_matrix.tolist() if color_matrix is not None else None,
+        }).encode('utf-8')
+        self.stream.write(PREAMBLE.pack(MAGIC, VERSION, len(header)))
+        self.stream.write(header)
+        self.nbytes = PREAMBLE.size + len(header)
+
+    def write_triplet(self, channel: int, sigma: float, u: np.ndarray, v: np.ndarray) -> None:
+        """Append one rank-1 term σ·u·vᵀ of a channel."""
+        if self.encoding == 'uint8':
+            q_u, u_scale, u_offset = quantize_rows(u[np.newaxis, :])
+            q_v, v_scale, v_offset = quantize_rows(v[np.newaxis, :])
+            fixed = self.record.pack(channel, sigma, u_scale[0], u_offset[0], v_scale[0], v_offset[0])
+            payload = q_u.tobytes() + q_v.tobytes()
+        else:
+            fixed = self.record.pack(channel, sigma)
+            payload = (u.astype(self.encoding).tobytes()
+                       + v.astype(self.encoding).tobytes())
+
+        self.stream.write(fixed)
+        self.stream.write(payload)
+        self.nbytes += len(fixed) + len(payload)
+
+
+def energy_order(S_list: List[np.ndarray], k: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Order the terms (channel, i) of all channels by descending σᵢ².
+
+    Args:
+        S_list: Singular values per channel
+        k: Use only the first k terms of every channel (None = all)
+    """
+    channels = np.concatenate([np.full(len(s[:k]), c) for c, s in enumerate(S_list)])
+    indices = np.concatenate([np.arange(len(s[:k])) for s in S_list])
+    energy = np.concatenate([np.square(s[:k], dtype=np.float64) for s in S_list])
+    order = np.argsort(-energy, kind='stable')
+    return [(int(channels[j]), int(indices[j])) for j in order]
+
+
+def write_progressive(
+    compressor,
+    stream: BinaryIO,
+    k: Optional[int] = None,
+    encoding: str = 'float16',
+) -> int:
+    """
+    Write the factors of an SVDCompressor as a progressive stream.
+
+    Args:
+        compressor: SVDCompressor after compute_svd/load_factors
+        stream: Writable binary stream (file, socket wrapper, BytesIO)
+        k: Maximum rank per channel (None = all available)
+        encoding: 'float32', 'float16' or 'uint8' for the singular vectors
+
+    Returns:
+        Number of bytes written
+    """
+    writer = ProgressiveWriter(stream, compressor.original_shape,
+                               compressor.is_grayscale, encoding,
+                               compressor.color_matrix)
+    for c, i in energy_order(compressor.S_list, k):
+        writer.write_triplet(
+            c, float(compressor.S_list[c][i]),
+            compressor.U_list[c][:, i], compressor.V_list[c][i, :]
+        )
+    return writer.nbytes
+
+
+def _read_exactly(stream: BinaryIO, size: int) -> bytes:
+    """Read size bytes; returns fewer only at the end of the stream."""
+    chunks = []
+    while size > 0:
+        chunk = stream.read(size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def iter_progressive(
+    stream: BinaryIO,
+    checkpoints: Optional[List[int]] = None,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Decode a progressive stream while it arrives.
+
+    The received triplets are collected per channel and added to the
+    channel accumulators in place with one matrix product per checkpoint.
+
+    Args:
+        stream: Readable binary stream
+        checkpoints: Byte counts after which a frame is produced
+            (default: 4 KB, 8 KB, 16 KB, ... doubling). A final frame is
+            always produced at the end of the stream.
+
+    Yields:
+        Tuples (bytes received, number of terms, uint8 frame)
+    """
+    magic, version, header_size = PREAMBLE.unpack(_read_exactly(stream, PREAMBLE.size))
+    if magic != MAGIC:
+        raise ValueError("Not a progressive SVD stream")
+    if version != VERSION:
+        raise ValueError(f"Unsupported stream version {version}")
+    header = json.loads(_read_exactly(stream, header_size).decode('utf-8'))
+
+    m, n, n_channels = header['image_shape']
+    encoding = header['encoding']
+    record = _record_struct(encoding)
+    vector_bytes = (m + n) * np.dtype(encoding).itemsize
+    received = PREAMBLE.size + header_size
+
+    accumulators = np.zeros((n_channels, m, n), dtype=np.float32)
+    color = header.get('color_matrix')
+    color = np.asarray(color, dtype=np.float32) if color is not None else None
+    scratch = np.empty((m, n), dtype=np.float32)
+    pending: List[List[Tuple[float, np.ndarray, np.ndarray]]] = [[] for _ in range(n_channels)]
+    terms = 0
+    yielded_terms = -1
+
+    if checkpoints is None:
+        checkpoints = [4096 * 2**i for i in range(40)]
+    checkpoints = sorted(checkpoints)
+    next_checkpoint = 0
+
+    def flush() -> np.ndarray:
+        # Add all pending rank-1 terms of each channel with one product
+        for c, terms_c in enumerate(pending):
+            if not terms_c:
+                continue
+            sigma = np.array([t[0] for t in terms_c], dtype=np.float32)
+            U = np.stack([t[1] for t in terms_c], axis=1)
+            Vt = np.stack([t[2] for t in terms_c], axis=0)
+            np.matmul(U * sigma, Vt, out=scratch)
+            accumulators[c] += scratch
+            terms_c.clear()
+        frame = accumulators.transpose(1, 2, 0)
+        if color is not None:
+            frame = frame @ color
+        frame = np.clip(frame, 0, 255).astype(np.uint8)
+        return frame[:, :, 0] if header['is_grayscale'] else frame
+
+    while True:
+        fixed = _read_exactly(stream, record.size)
+        payload = _read_exactly(stream, vector_bytes) if len(fixed) == record.size else b''
+        if len(payload) < vector_bytes:
+            break  # end of stream (or a truncated last record)
+
+        values = record.unpack(fixed)
+        channel, sigma = values[0], values[1]
+        if encoding == 'uint8':
+            q = np.frombuffer(payload, dtype=np.uint8)
+            u = dequantize_rows(q[np.newaxis, :m], np.float32([values[2]]), np.float32([values[3]]))[0]
+            v = dequantize_rows(q[np.newaxis, m:], np.float32([values[4]]), np.float32([values[5]]))[0]
+        else:
+            data = np.frombuffer(payload, dtype=encoding).astype(np.float32)
+            u, v = data[:m], data[m:]
+
+        pending[channel].append((sigma, u, v))
+        received += record.size + vector_bytes
+        terms += 1
+
+        if next_checkpoint < len(checkpoints) and received >= checkpoints[next_checkpoint]:
+            while next_checkpoint < len(checkpoints) and received >= checkpoints[next_checkpoint]:
+                next_checkpoint += 1
+            yielded_terms = terms
+            yield received, terms, flush()
+
+    if terms != yielded_terms:
+        yield received, terms, flush()
@@ -0,0 +1,191 @@
+"""
+SVD Sequence Compression
+========================
+Compression of frame sequences (videos, simulation snapshots) whose
+consecutive frames differ only slightly.
+
+Instead of a full SVD per frame, every channel keeps an orthonormal basis
+pair U ∈ ℝ^(m×r), V ∈ ℝ^(n×r) that is shared by consecutive frames. A new
+frame A is projected onto the current basis,
+
+    C = Uᵀ A V,    ||A - U C Vᵀ||_F² = ||A||_F² - ||C||_F²,
+
+which costs O(r·m·n) and stores only the r×r core C. For small errors the
+difference cancels, and the residual is measured directly instead. The basis
+is changed only when the relative projection error exceeds the tolerance:
+
+    1. augment: the leading directions of the residual A - U C Vᵀ are
+       appended to U and V (re-orthonormalized with QR), as long as the
+       basis stays below max_basis_rank;
+    2. refactor: otherwise the frame is decomposed anew with a randomized
+       SVD of the target rank. If its tail energy still exceeds the
+       tolerance, a full SVD is computed and truncated to the smallest rank
+       within the tolerance.
+
+A frame that cannot meet the tolerance even then (e.g. tolerance 0 in
+float32) is still stored, but its code has within_tolerance = False and
+stats['violations'] counts such channels.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from svd_compressor import randomized_svd, squared_norm
+
+
+class SequenceCompressor:
+    """
+    Compress frames against shared, incrementally updated bases.
+
+    Args:
+        rank: Rank of a freshly computed basis
+        tolerance: Maximum relative error ||A - Ã||_F / ||A||_F per channel
+        augment_rank: Number of residual directions added per augmentation
+        max_basis_rank: Largest basis before a refactorization (default 2·rank)
+        dtype: Working precision of the bases
+    """
+
+    def __init__(
+        self,
+        rank: int = 50,
+        tolerance: float = 0.02,
+        augment_rank: int = 8,
+        max_basis_rank: Optional[int] = None,
+        dtype=np.float32,
+    ):
+        self.rank = rank
+        self.tolerance = tolerance
+        self.augment_rank = augment_rank
+        self.max_basis_rank = max_basis_rank or 2 * rank
+        self.dtype = np.dtype(dtype)
+
+        # bases[(channel, version)] = (U, V)
+        self.bases: Dict[tuple, tuple] = {}
+        self._current: List[int] = []
+        self.stats = {'reuse': 0, 'augment': 0, 'refactor': 0, 'violations': 0, 'time': 0.0}
+
+    def _project(self, A: np.ndarray, U: np.ndarray, V: np.ndarray):
+        """Core C = Uᵀ A V and the squared projection error."""
+        C = (U.T @ A) @ V
+        total = squared_norm(A)
+        error_sq = total - squared_norm(C)
+        # ||A||² - ||C||² cancels once the error is small against the rounding
+        # of C (about sqrt(n)·eps·||A||²); then measure the residual directly
+        if error_sq < 100 * np.sqrt(max(A.shape)) * np.finfo(self.dtype).eps * total:
+            error_sq = squared_norm(A - (U @ C) @ V.T)
+        return C, max(error_sq, 0.0)
+
+    def _new_version(self, channel: int, U: np.ndarray, V: np.ndarray) -> int:
+        version = self._current[channel] + 1
+        self.bases[(channel, version)] = (U, V)
+        self._current[channel] = version
+        return version
+
+    def _compress_channel(self, channel: int, A: np.ndarray):
+        """Return (basis version, core, squared error, method) for one channel."""
+        budget = self.tolerance**2 * squared_norm(A)
+
+        if self._current[channel] >= 0:
+            U, V = self.bases[(channel, self._current[channel])]
+            C, error_sq = self._project(A, U, V)
+            if error_sq <= budget:
+                return self._current[channel], C, error_sq, 'reuse'
+
+            if U.shape[1] + self.augment_rank <= self.max_basis_rank:
+                # Refactor only the residual and extend the basis
+                residual = A - (U @ C) @ V.T
+                Ur, _, Vrt = randomized_svd(residual, self.augment_rank)
+                U_new, _ = np.linalg.qr(np.hstack([U, Ur]))
+                V_new, _ = np.linalg.qr(np.hstack([V, Vrt.T]))
+                C, error_sq = self._project(A, U_new, V_new)
+                if error_sq <= budget:
+                    version = self._new_version(channel, U_new, V_new)
+                    return version, C, error_sq, 'augment'
+
+        return self._refactor(channel, A, budget)
+
+    def _refactor(self, channel: int, A: np.ndarray, budget: float):
+        """New basis of rank self.rank, or larger if the spectrum requires it."""
+        # Errors are measured on the residual: ||A||² - ||s||² cancels for small tolerances
+        U, s, Vt = randomized_svd(A, self.rank)
+        error_sq = squared_norm(A - (U * s) @ Vt)
+        if error_sq > budget:
+            # Randomized rank too small: smallest rank within the budget from the full
+            # spectrum, tail[k] = Σᵢ₌ₖ σᵢ² summed from the small end
+            U, s, Vt = np.linalg.svd(A, full_matrices=False)
+            tail = np.append(np.cumsum((s.astype(np.float64)**2)[::-1])[::-1], 0.0)
+            k = max(1, int(np.count_nonzero(tail > budget)))
+            while True:
+                error_sq = squared_norm(A - (U[:, :k] * s[:k]) @ Vt[:k])
+                if error_sq <= budget or k == len(s):
+                    break
+                k += 1
+            U, s, Vt = U[:, :k], s[:k], Vt[:k]
+
+        version = self._new_version(channel, U, Vt.T)
+        return version, np.diag(s), error_sq, 'refactor'
+
+    def compress_frame(self, frame: np.ndarray) -> Dict[str, object]:
+        """
+        Compress one frame of shape (m, n) or (m, n, channels).
+
+        Returns:
+            Frame code with the basis version and core of every channel,
+            the Frobenius error, the costliest method that was needed and
+            whether every channel met the tolerance
+        """
+        start = time.perf_counter()
+        data = np.asarray(frame, dtype=self.dtype)
+        if data.ndim == 2:
+            data = data[:, :, np.newaxis]
+        if not self._current:
+            self._current = [-1] * data.shape[2]
+
+        versions, cores, total_error_sq = [], [], 0.0
+        methods = []
+        within_tolerance = True
+        for c in range(data.shape[2]):
+            A = data[:, :, c]
+            version, C, error_sq, method = self._compress_channel(c, A)
+            versions.append(version)
+            cores.append(C)
+            total_error_sq += error_sq
+            methods.append(method)
+            self.stats[method] += 1
+            if error_sq > self.tolerance**2 * squared_norm(A):
+                within_tolerance = False
+                self.stats['violations'] += 1
+
+        self.stats['time'] += time.perf_counter() - start
+        total = squared_norm(data.reshape(-1))
+        method = max(methods, key=['reuse', 'augment', 'refactor'].index)
+        return {
+            'shape': data.shape,
+            'basis': versions,
+            'cores': cores,
+            'error': float(np.sqrt(total_error_sq)),
+            'relative_error': float(np.sqrt(total_error_sq / total)) if total > 0 else 0.0,
+            'method': method,
+            'within_tolerance': within_tolerance,
+        }
+
+    def compress(self, frames: Iterable[np.ndarray]) -> List[Dict[str, object]]:
+        """Compress a sequence of frames in order."""
+        return [self.compress_frame(frame) for frame in frames]
+
+    def reconstruct(self, code: Dict[str, object]) -> np.ndarray:
+        """Reconstruct a frame code as uint8 image (2D for one channel)."""
+        channels = []
+        for c, (version, C) in enumerate(zip(code['basis'], code['cores'])):
+            U, V = self.bases[(c, version)]
+            channels.append((U @ C) @ V.T)
+        image = np.clip(np.stack(channels, axis=2), 0, 255).astype(np.uint8)
+        return image[:, :, 0] if image.shape[2] == 1 else image
+
+    def storage_size(self, codes: List[Dict[str, object]], bytes_per_value: int = 4) -> int:
+        """Bytes for all bases plus all frame cores."""
+        values = sum(U.size + V.size for U, V in self.bases.values())
+        values += sum(C.size for code in codes for C in code['cores'])
+        return values * bytes_per_value
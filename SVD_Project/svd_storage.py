@@ -0,0 +1,318 @@
+"""
+SVD Factor Storage
+==================
+Compact on-disk format for truncated SVD factors.
+
+Layout of a factor file (all integers little-endian):
+
+    offset 0   magic b'SVDF', format version (uint16), reserved (uint16),
+               offset of the JSON index (uint64)
+    offset 16  array data, every array aligned to ALIGNMENT bytes
+    ...        JSON index describing the image and every stored block
+
+A block is the rank-k factorization of one channel of one image region
+(the whole image, or a tile for out-of-core compression). Per block the file
+holds s (k,), Uᵀ (k×m) and Vᵀ (k×n), so every singular vector is one
+contiguous row. Since the index is written last, blocks can be streamed to
+disk one at a time, and the whole file can be opened with np.memmap.
+
+Encodings of the singular vectors:
+
+    float64, float32, float16   plain IEEE values
+    uint8                       per-vector affine quantization
+                                x ≈ offset + scale·q with q ∈ {0, ..., 255}
+
+For the float64 and float32 encodings the factors returned by FactorFile are
+views into the memory map, so reconstruction reads directly from the file.
+"""
+
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+MAGIC = b'SVDF'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQ')
+ALIGNMENT = 64
+
+ENCODINGS = ('float64', 'float32', 'float16', 'uint8')
+
+
+def _aligned(offset: int) -> int:
+    """Round offset up to the next multiple of ALIGNMENT."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _block_arrays(m: int, n: int, k: int, encoding: str) -> List[Tuple[str, str, Tuple[int, ...]]]:
+    """
+    List the arrays stored for one rank-k block of size m×n.
+
+    Returns:
+        List of (name, dtype, shape) in storage order
+    """
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}', expected one of {ENCODINGS}")
+
+    value_dtype = 'float64' if encoding == 'float64' else 'float32'
+    arrays = [
+        ('s', value_dtype, (k,)),
+        ('Ut', encoding, (k, m)),
+        ('Vt', encoding, (k, n)),
+    ]
+    if encoding == 'uint8':
+        arrays += [
+            ('U_scale', 'float32', (k,)),
+            ('U_offset', 'float32', (k,)),
+            ('V_scale', 'float32', (k,)),
+            ('V_offset', 'float32', (k,)),
+        ]
+    return arrays
+
+
+def quantize_rows(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize every row of X to 8 bits with its own affine map.
+
+    Returns:
+        Tuple (q, scale, offset) with X ≈ offset[:, None] + scale[:, None]·q
+    """
+    lo = X.min(axis=1)
+    hi = X.max(axis=1)
+    scale = (hi - lo) / 255.0
+    safe = np.where(scale > 0, scale, 1.0)
+    q = np.rint((X - lo[:, np.newaxis]) / safe[:, np.newaxis])
+    return q.astype(np.uint8), scale.astype(np.float32), lo.astype(np.float32)
+
+
+def dequantize_rows(q: np.ndarray, scale: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """Invert quantize_rows in float32."""
+    return offset[:, np.newaxis] + scale[:, np.newaxis] * q.astype(np.float32)
+
+
+class FactorWriter:
+    """
+    Streaming writer for factor files.
+
+    Blocks are appended one at a time with add_block; close() writes the
+    index and patches its offset into the header. With path=None nothing is
+    written and only the file size is accounted, which gives the exact size
+    of a file before encoding it.
+
+    Example:
+        with FactorWriter(path, image_shape, 'float32') as writer:
+            writer.add_block(0, (0, 0), U, s, Vt, tail_sq)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str],
+        image_shape: Tuple[int, ...],
+        encoding: str = 'float32',
+        is_grayscale: bool = False,
+        metadata: Optional[Dict[str, object]] = None,
+    ):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}', expected one of {ENCODINGS}")
+
+        self.path = path
+        self.encoding = encoding
+        self.index: Dict[str, object] = {
+            'image_shape': list(image_shape),
+            'is_grayscale': is_grayscale,
+            'encoding': encoding,
+            'metadata': metadata or {},
+            'blocks': [],
+        }
+        self.position = HEADER.size
+        self.nbytes = 0
+        self._file = open(path, 'wb') if path is not None else None
+        if self._file is not None:
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0, 0))
+
+    def __enter__(self) -> 'FactorWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def add_block(
+        self,
+        channel: int,
+        origin: Tuple[int, int],
+        U: Optional[np.ndarray],
+        s: Optional[np.ndarray],
+        Vt: Optional[np.ndarray],
+        tail_sq: float = 0.0,
+        shape: Optional[Tuple[int, int, int]] = None,
+    ) -> None:
+        """
+        Append the rank-k factors of one channel region.
+
+        Args:
+            channel: Channel index of the block
+            origin: (row, column) of the block's top-left pixel
+            U, s, Vt: Factors with U ∈ ℝ^(m×k), s ∈ ℝ^k, Vt ∈ ℝ^(k×n)
+            tail_sq: Squared Frobenius error of the stored rank-k block
+            shape: (m, n, k) for a size-only writer (U, s, Vt may be None)
+        """
+        if shape is None:
+            shape = (U.shape[0], Vt.shape[1], len(s))
+        m, n, k = shape
+
+        layout = _block_arrays(m, n, k, self.encoding)
+        data = self._encode(U, s, Vt) if self._file is not None else {}
+
+        entries = {}
+        for name, dtype, array_shape in layout:
+            start = _aligned(self.position)
+            size = int(np.prod(array_shape)) * np.dtype(dtype).itemsize
+            if self._file is not None:
+                self._file.write(b'\0' * (start - self.position))
+                self._file.write(np.ascontiguousarray(data[name], dtype=dtype).tobytes())
+            entries[name] = {'offset': start, 'dtype': dtype, 'shape': list(array_shape)}
+            self.position = start + size
+
+        self.index['blocks'].append({
+            'channel': channel,
+            'origin': list(origin),
+            'shape': [m, n],
+            'rank': k,
+            'tail_sq': float(tail_sq),
+            'arrays': entries,
+        })
+
+    def _encode(self, U: np.ndarray, s: np.ndarray, Vt: np.ndarray) -> Dict[str, np.ndarray]:
+        """Convert factors to the stored arrays."""
+        if self.encoding != 'uint8':
+            return {'s': s, 'Ut': U.T, 'Vt': Vt}
+
+        Ut_q, U_scale, U_offset = quantize_rows(U.T)
+        Vt_q, V_scale, V_offset = quantize_rows(Vt)
+        return {
+            's': s, 'Ut': Ut_q, 'Vt': Vt_q,
+            'U_scale': U_scale, 'U_offset': U_offset,
+            'V_scale': V_scale, 'V_offset': V_offset,
+        }
+
+    def close(self) -> int:
+        """
+        Write the index and finish the file.
+
+        Returns:
+            Total file size in bytes
+        """
+        if self.nbytes:
+            return self.nbytes
+
+        index_offset = self.position
+        index = json.dumps(self.index, separators=(',', ':')).encode('utf-8')
+        self.nbytes = index_offset + len(index)
+
+        if self._file is not None:
+            self._file.write(index)
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, VERSION, 0, index_offset))
+            self._file.close()
+            self._file = None
+
+        return self.nbytes
+
+
+class FactorFile:
+    """
+    Read-only, memory-mapped view of a factor file.
+
+    Attributes:
+        image_shape: (m, n, channels) of the encoded image
+        is_grayscale: Whether the image was loaded as grayscale
+        encoding: Encoding of the singular vectors
+        blocks: Index entries of all blocks in file order
+        nbytes: File size in bytes
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+
+        magic, version, _, index_offset = HEADER.unpack(bytes(self._map[:HEADER.size]))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an SVD factor file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported factor file version {version}")
+
+        index = json.loads(bytes(self._map[index_offset:]).decode('utf-8'))
+        self.image_shape: Tuple[int, ...] = tuple(index['image_shape'])
+        self.is_grayscale: bool = index['is_grayscale']
+        self.encoding: str = index['encoding']
+        self.metadata: Dict[str, object] = index['metadata']
+        self.blocks: List[Dict[str, object]] = index['blocks']
+        self.nbytes = len(self._map)
+
+    def _array(self, entry: Dict[str, object]) -> np.ndarray:
+        """Zero-copy view of one stored array."""
+        return np.ndarray(
+            tuple(entry['shape']), dtype=entry['dtype'],
+            buffer=self._map, offset=entry['offset']
+        )
+
+    def block_factors(self, index: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the factors (U, s, Vt) of one block.
+
+        float64/float32 factors are views into the memory map (U is the
+        transpose of the stored Uᵀ). float16 and uint8 factors are decoded
+        to float32, which copies only the k×(m+n) factor entries.
+        """
+        arrays = {name: self._array(entry) for name, entry in self.blocks[index]['arrays'].items()}
+        s = arrays['s']
+
+        if self.encoding == 'uint8':
+            Ut = dequantize_rows(arrays['Ut'], arrays['U_scale'], arrays['U_offset'])
+            Vt = dequantize_rows(arrays['Vt'], arrays['V_scale'], arrays['V_offset'])
+        elif self.encoding == 'float16':
+            Ut = arrays['Ut'].astype(np.float32)
+            Vt = arrays['Vt'].astype(np.float32)
+        else:
+            Ut, Vt = arrays['Ut'], arrays['Vt']
+
+        return Ut.T, s, Vt
+
+    def reconstruct(self, k: Optional[int] = None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Reconstruct the image from all stored blocks.
+
+        Args:
+            k: Maximum rank per block (None = stored rank)
+            out: uint8 array of shape (m, n, channels) to write into, e.g. a
+                np.memmap for images that do not fit into memory
+
+        Returns:
+            uint8 image of the original shape (2D for grayscale)
+        """
+        m, n, n_channels = self.image_shape
+        image = np.zeros((m, n, n_channels), dtype=np.uint8) if out is None else out
+
+        # Factors of a rotated color space (see svd_compressor.color_matrix)
+        # are combined in float before the conversion back to RGB
+        color = self.metadata.get('color_matrix')
+        target = image if color is None else np.zeros((m, n, n_channels), dtype=np.float32)
+
+        for i, block in enumerate(self.blocks):
+            U, s, Vt = self.block_factors(i)
+            kb = len(s) if k is None else min(k, len(s))
+            row, col = block['origin']
+            bm, bn = block['shape']
+            tile = (U[:, :kb] * s[:kb]) @ Vt[:kb, :]
+            if color is None:
+                tile = np.clip(tile, 0, 255)
+            target[row:row + bm, col:col + bn, block['channel']] = tile
+
+        if color is not None:
+            image[...] = np.clip(target @ np.asarray(color, dtype=np.float32), 0, 255)
+
+        if self.is_grayscale:
+            image = image[:, :, 0]
+        return image
@@ -0,0 +1,279 @@
+"""
+Tiled SVD Compression
+=====================
+Out-of-core SVD compression for images that do not fit into memory as
+floating-point arrays (scanned maps, microscopy mosaics, ...).
+
+The image is split into tiles of at most tile_size × tile_size pixels. Each
+tile channel is read lazily, compressed with its own rank and streamed to a
+factor file (see svd_storage), so only one tile is held as a float array at
+a time.
+
+Peak memory is bounded by the tile size only for *.npy and raw uint8 input,
+which are memory-mapped. Other formats (PNG, JPEG, TIFF, ...) are decoded
+completely by PIL on the first tile access, so the whole image is held as
+8-bit samples. For such files, convert_to_raw decodes the image once into
+a raw buffer; later runs then read it tile by tile.
+
+The ranks are chosen to meet a global error budget ε for the whole image:
+
+    ||A - Ã||_F² = Σ_tiles Σ_{i > k_t} σ_{t,i}² ≤ ε²
+
+With allocation='global' a first pass computes only the singular values of
+every tile. Dropping the terms with the smallest energy per stored value
+σ²/(m_t + n_t + 1) first then minimizes the file size for the budget; within
+a tile this ratio decreases with i, so the kept terms form a prefix and
+define the tile rank k_t. The second pass computes the factors. With
+allocation='area' every tile gets the share of ε² proportional to its pixel
+count, which needs only a single pass.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from svd_storage import FactorWriter
+
+
+@contextmanager
+def _unlimited_pixels():
+    """
+    Lift PIL's decompression bomb limit (Image.MAX_IMAGE_PIXELS).
+
+    The limit rejects images above about 179 megapixels, i.e. exactly the
+    large scans this module is meant for. The input files are trusted here.
+    """
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        yield
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+
+class ImageTileSource:
+    """
+    Read tiles from an image file with PIL region crops.
+
+    PIL decodes the whole file on the first access (also for tiled TIFF);
+    the decoded data is kept as 8-bit samples, and only the current tile is
+    converted to float. Memory is therefore not bounded by the tile size;
+    use convert_to_raw for images that do not fit into memory as 8-bit.
+    """
+
+    def __init__(self, filepath: str):
+        with _unlimited_pixels():
+            self.image = Image.open(filepath)
+            self.is_grayscale = self.image.mode == 'L'
+            if not self.is_grayscale and self.image.mode != 'RGB':
+                self.image = self.image.convert('RGB')
+        width, height = self.image.size
+        self.shape = (height, width, 1 if self.is_grayscale else 3)
+
+    def read_tile(self, row: int, col: int, height: int, width: int) -> np.ndarray:
+        """Return the tile as float32 array of shape (height, width, channels)."""
+        with _unlimited_pixels():  # some decoders check the size again on load
+            tile = self.image.crop((col, row, col + width, row + height))
+        data = np.asarray(tile, dtype=np.float32)
+        return data.reshape(height, width, self.shape[2])
+
+
+class ArrayTileSource:
+    """
+    Read tiles from an array-like, e.g. np.load(..., mmap_mode='r') or a
+    np.memmap of a raw 8-bit buffer. Only the requested tile is copied.
+    """
+
+    def __init__(self, array: np.ndarray):
+        if array.ndim == 2:
+            array = array[:, :, np.newaxis]
+        self.array = array
+        self.shape = array.shape
+        self.is_grayscale = array.shape[2] == 1
+
+    def read_tile(self, row: int, col: int, height: int, width: int) -> np.ndarray:
+        """Return the tile as float32 array of shape (height, width, channels)."""
+        return np.asarray(
+            self.array[row:row + height, col:col + width, :], dtype=np.float32
+        )
+
+
+def convert_to_raw(filepath: str, raw_path: str, rows_per_chunk: int = 1024) -> Tuple[int, int, int]:
+    """
+    Decode an image once into a raw uint8 buffer for open_source(raw_shape=...).
+
+    The decode itself needs the whole image in memory (PIL), but every later
+    compression pass then reads only one tile at a time from the memmap.
+
+    Returns:
+        (height, width, channels) to pass as raw_shape
+    """
+    source = ImageTileSource(filepath)
+    height, width, channels = source.shape
+    raw = np.memmap(raw_path, dtype=np.uint8, mode='w+', shape=source.shape)
+    with _unlimited_pixels():
+        for row in range(0, height, rows_per_chunk):
+            rows = min(rows_per_chunk, height - row)
+            strip = source.image.crop((0, row, width, row + rows))
+            raw[row:row + rows] = np.asarray(strip, dtype=np.uint8).reshape(rows, width, channels)
+    raw.flush()
+    del raw
+    return source.shape
+
+
+def open_source(
+    filepath: str,
+    raw_shape: Optional[Tuple[int, ...]] = None,
+):
+    """
+    Open a tile source for filepath.
+
+    Args:
+        filepath: Image file, *.npy array or raw uint8 buffer
+        raw_shape: (height, width[, channels]) of a raw buffer
+    """
+    if raw_shape is not None:
+        return ArrayTileSource(np.memmap(filepath, dtype=np.uint8, mode='r', shape=raw_shape))
+    if filepath.lower().endswith('.npy'):
+        return ArrayTileSource(np.load(filepath, mmap_mode='r'))
+    return ImageTileSource(filepath)
+
+
+class TiledSVDCompressor:
+    """
+    Tile-by-tile SVD compressor with a global error budget.
+
+    For memory-mapped sources (*.npy, raw), peak memory is bounded by a few
+    float copies of one tile plus the singular values of all tiles (for
+    allocation='global'). PIL sources add the decoded 8-bit image.
+    """
+
+    def __init__(
+        self,
+        tile_size: int = 512,
+        encoding: str = 'float32',
+        allocation: str = 'global',
+    ):
+        if allocation not in ('global', 'area'):
+            raise ValueError("allocation must be 'global' or 'area'")
+        self.tile_size = tile_size
+        self.encoding = encoding
+        self.allocation = allocation
+
+    def iter_tiles(self, shape: Tuple[int, ...]) -> Iterator[Tuple[int, int, int, int]]:
+        """Yield (row, col, height, width) of all tiles in row-major order."""
+        m, n = shape[0], shape[1]
+        for row in range(0, m, self.tile_size):
+            for col in range(0, n, self.tile_size):
+                yield row, col, min(self.tile_size, m - row), min(self.tile_size, n - col)
+
+    def singular_values(self, source) -> List[List[np.ndarray]]:
+        """First pass: singular values of every tile channel."""
+        spectra = []
+        for row, col, height, width in self.iter_tiles(source.shape):
+            tile = source.read_tile(row, col, height, width)
+            spectra.append([
+                np.linalg.svd(tile[:, :, c], compute_uv=False)
+                for c in range(tile.shape[2])
+            ])
+        return spectra
+
+    @staticmethod
+    def allocate_ranks(
+        spectra: List[List[np.ndarray]],
+        tiles: List[Tuple[int, int, int, int]],
+        target_error: float,
+    ) -> List[List[int]]:
+        """
+        Choose per-tile ranks that meet ||A - Ã||_F ≤ target_error with the
+        fewest stored values (greedy over σ²/(m_t + n_t + 1)).
+        """
+        energies, costs, owners = [], [], []
+        for t, ((_, _, height, width), channel_spectra) in enumerate(zip(tiles, spectra)):
+            for c, s in enumerate(channel_spectra):
+                energies.append(s.astype(np.float64)**2)
+                costs.append(np.full(len(s), height + width + 1))
+                owners.append(np.full(len(s), t * len(channel_spectra) + c))
+        energies = np.concatenate(energies)
+        ratio = energies / np.concatenate(costs)
+        owners = np.concatenate(owners)
+
+        # Drop the least valuable terms while the budget allows
+        order = np.argsort(ratio, kind='stable')
+        dropped = np.cumsum(energies[order]) <= target_error**2
+        kept = np.ones(len(energies), dtype=bool)
+        kept[order[dropped]] = False
+
+        counts = np.bincount(owners[kept], minlength=owners.max() + 1)
+        n_channels = len(spectra[0])
+        return [
+            counts[t * n_channels:(t + 1) * n_channels].tolist()
+            for t in range(len(tiles))
+        ]
+
+    def compress(
+        self,
+        source,
+        output_path: str,
+        target_error: Optional[float] = None,
+        max_rank: Optional[int] = None,
+    ) -> Dict[str, object]:
+        """
+        Compress a tile source and stream the factors to output_path.
+
+        Args:
+            source: ImageTileSource/ArrayTileSource (see open_source)
+            output_path: Factor file to write
+            target_error: Global Frobenius error budget ε (None = no budget)
+            max_rank: Upper bound of every tile rank
+
+        Returns:
+            Summary with tile ranks, total error and file size in bytes
+        """
+        tiles = list(self.iter_tiles(source.shape))
+        n_pixels = source.shape[0] * source.shape[1]
+
+        ranks = None
+        if target_error is not None and self.allocation == 'global':
+            ranks = self.allocate_ranks(self.singular_values(source), tiles, target_error)
+
+        metadata = {'tile_size': self.tile_size, 'target_error': target_error}
+        total_tail = 0.0
+        all_ranks = []
+
+        with FactorWriter(output_path, source.shape, self.encoding,
+                          source.is_grayscale, metadata) as writer:
+            for t, (row, col, height, width) in enumerate(tiles):
+                tile = source.read_tile(row, col, height, width)
+                tile_ranks = []
+
+                for c in range(tile.shape[2]):
+                    U, s, Vt = np.linalg.svd(tile[:, :, c], full_matrices=False)
+
+                    if ranks is not None:
+                        k = ranks[t][c]
+                    elif target_error is not None:
+                        # Share of the budget proportional to the tile area
+                        budget = target_error**2 * height * width / n_pixels / tile.shape[2]
+                        tail = np.cumsum((s**2)[::-1])[::-1]
+                        k = int(np.count_nonzero(tail > budget))
+                    else:
+                        k = len(s)
+                    if max_rank is not None:
+                        k = min(k, max_rank)
+
+                    tail_sq = float(np.sum(s[k:].astype(np.float64)**2))
+                    writer.add_block(c, (row, col), U[:, :k], s[:k], Vt[:k, :], tail_sq)
+                    total_tail += tail_sq
+                    tile_ranks.append(k)
+
+                all_ranks.append(tile_ranks)
+
+        return {
+            'tiles': tiles,
+            'ranks': all_ranks,
+            'error': float(np.sqrt(total_tail)),
+            'bytes': writer.nbytes,
+        }
@@ -8,9 +8,12 @@ komplexen Ebene visualisiert.
 
 # Pflichtaufgabe 8 – Eigenwerte über charakteristisches Polynom und direkte Methoden
 
-import sympy as sy
+import numpy as np
 import matplotlib.pyplot as plt
 
+from eigen_engine import (companion_matrix, companion_eigenvalues,
+                          similar_eigenvalues, sympy_reference, spectral_distance)
+
 # Dimension der Matrix
 
 N =12 # doppelt ko nj ug ie rt komplexe EW -1 \ pm i , -2 \ pm 2* i , -3 \ pm 3* i
@@ -21,57 +24,54 @@ zei = [ -82944 , -304128 , -557568 , -649344 , -529168 , -315264 ,
 # Die Koeffizienten erzeugen eine Matrix A mit diesen Eigenwerten
 #zei = [-288, -528, -484, -240, -72, -12]
 
+RTOL = 1e-10  # gewünschte relative Genauigkeit der Eigenwerte
+SYMPY_CHECK = N <= 12  # SymPy-Referenz nur für kleine N (langsam)
 
-# Konstruktion der Matrix A (N×N)
-A = sy.zeros(N - 1, N)
-for i in range(N - 1):
-    A[i, i + 1] = 1
-A = A.row_insert(N - 1, sy.Matrix(1, N, zei))  # letzte Zeile hinzufügen
-
-# Zufallsmatrix T zur Erzeugung einer ähnlichen Matrix B
-T = sy.randMatrix(N, N, -10, 10) / 10.01
-B = T.inv() * A * T  # B = T⁻¹ A T
 
-# Charakteristische Polynome von A und B
-pA = A.charpoly().as_expr()
-pB = B.charpoly().as_expr()
+# Konstruktion der Matrix A (N×N) direkt in NumPy
+A = companion_matrix(zei)
 
-# Numerische Nullstellen der charakteristischen Polynome
-ewA_roots = sy.nroots(pA)
-ewB_roots = sy.nroots(pB)
+# Zufallsmatrix T zur Erzeugung einer ähnlichen Matrix B = T⁻¹ A T
+# (ganzzahlige Einträge in [-10, 10], geteilt durch 10.01; B über solve statt Inverse)
+rng = np.random.default_rng()
+T_int = rng.integers(-10, 11, size=(N, N))
 
-# Direkte Berechnung der Eigenwerte
-ewA_direct = list(A.eigenvals().keys())
-ewB_direct = list(B.eigenvals().keys())
+# Eigenwerte in float64 (LAPACK); mpmath nur, wenn die Kondition es verlangt
+resA = companion_eigenvalues(zei, RTOL)
+B, resB = similar_eigenvalues(A, T_int, 10.01, RTOL)
+ewA_float = np.linalg.eigvals(A)
+ewB_float = np.linalg.eigvals(B)
 
-# Aufteilung in Real- und Imaginärteil für Plot
-def get_parts(eigenlist):
-    return [sy.re(z).evalf() for z in eigenlist], [sy.im(z).evalf() for z in eigenlist]
+for name, res in (("A", resA), ("B", resB)):
+    print(f"{name}: max. Kondition {res['condition'].max():.2e}, "
+          f"Rechnung in {res['precision']} ({res['dps']} Stellen), "
+          f"Fehlerschätzung {res['error_estimate'].max():.2e}")
 
-ewA_re, ewA_im = get_parts(ewA_roots)
-ewB_re, ewB_im = get_parts(ewB_roots)
-ewA_dre, ewA_dim = get_parts(ewA_direct)
-ewB_dre, ewB_dim = get_parts(ewB_direct)
+if SYMPY_CHECK:
+    reference = sympy_reference(zei)
+    if reference is not None:
+        print(f"Abstand zu SymPy: A {spectral_distance(resA['values'], reference):.2e}, "
+              f"B {spectral_distance(resB['values'], reference):.2e}")
 
 # Visualisierung
 fig, axs = plt.subplots(2, 2, figsize=(10, 8))
 fig.suptitle("Eigenwerte in der komplexen Ebene")
 
-# A: Wurzeln von pA
-axs[0, 0].scatter(ewA_re, ewA_im, color='red')
-axs[0, 0].set_title("Nullstellen von pA (Matrix A)")
+# A: float64 (LAPACK)
+axs[0, 0].scatter(ewA_float.real, ewA_float.imag, color='red')
+axs[0, 0].set_title("Eigenwerte von A (float64)")
 
-# B: Wurzeln von pB
-axs[0, 1].scatter(ewB_re, ewB_im, color='blue')
-axs[0, 1].set_title("Nullstellen von pB (Matrix B)")
+# B: float64 (LAPACK)
+axs[0, 1].scatter(ewB_float.real, ewB_float.imag, color='blue')
+axs[0, 1].set_title("Eigenwerte von B (float64)")
 
-# A: direkte Methode
-axs[1, 0].scatter(ewA_dre, ewA_dim, color='green')
-axs[1, 0].set_title("Direkte Eigenwerte von A")
+# A: adaptive Genauigkeit
+axs[1, 0].scatter(resA['values'].real, resA['values'].imag, color='green')
+axs[1, 0].set_title(f"Eigenwerte von A ({resA['precision']})")
 
-# B: direkte Methode
-axs[1, 1].scatter(ewB_dre, ewB_dim, color='purple')
-axs[1, 1].set_title("Direkte Eigenwerte von B")
+# B: adaptive Genauigkeit
+axs[1, 1].scatter(resB['values'].real, resB['values'].imag, color='purple')
+axs[1, 1].set_title(f"Eigenwerte von B ({resB['precision']})")
 
 # Achsenformatierung
 for ax in axs.flat:
@@ -9,6 +9,9 @@ import sympy as sy
 import numpy as np
 import time
 
+from determinants import hilbert, det_laplace_memo, det_bareiss, det_lu, det_modular
+from log_determinant import slogdet
+
 # Laplace-Entwicklung rekursiv
 def det_laplace(A):
     n = A.shape[0]
@@ -26,6 +29,7 @@ def det_laplace(A):
 # Beispielmatrix: Hilbert-Matrix
 N = 10
 A = sy.Matrix(N, N, lambda i, j: sy.Rational(1, i + j + 1))
+H = hilbert(N)  # dieselbe Matrix als Liste von Fractions (ohne SymPy)
 
 # Numerisch (mit NumPy)
 Anum = sy.matrix2numpy(A, dtype='float64')
@@ -33,12 +37,38 @@ start = time.time()
 det_numpy = np.linalg.det(Anum)
 print(f"Det(Numpy) = {det_numpy:.6e}, Zeit: {time.time() - start:.4f} s")
 
+# Numerisch stabil: Vorzeichen und ln|det| mit Fehlerschätzung
+start = time.time()
+logdet = slogdet(Anum)
+print(f"Det(slogdet) = {logdet['sign']:+.0f}·exp({logdet['logabsdet']:.10f}) "
+      f"± {logdet['error_estimate']:.1e} ({logdet['precision']}), Zeit: {time.time() - start:.4f} s")
+
+# Numerisch (eigene LU-Zerlegung)
+start = time.time()
+det_lu_value = det_lu(Anum)
+print(f"Det(LU) = {det_lu_value:.6e}, Zeit: {time.time() - start:.4f} s")
+
 # Symbolisch (mit SymPy)
 start = time.time()
 det_sympy = A.det()
 print(f"Det(Sympy) = {det_sympy}, Zeit: {time.time() - start:.4f} s")
 
-# Rekursiv (mit Laplace)
+# Exakt, bruchfrei (Bareiss)
+start = time.time()
+det_bar = det_bareiss(H)
+print(f"Det(Bareiss) = {det_bar}, Zeit: {time.time() - start:.4f} s")
+
+# Exakt, modulo vieler Primzahlen mit chinesischem Restsatz
+start = time.time()
+det_mod = det_modular(H)
+print(f"Det(Multimodular) = {det_mod}, Zeit: {time.time() - start:.4f} s")
+
+# Laplace mit gespeicherten Unterdeterminanten, O(n·2ⁿ)
+start = time.time()
+det_memo = det_laplace_memo(H)
+print(f"Det(Laplace, Bitmaske) = {det_memo}, Zeit: {time.time() - start:.4f} s")
+
+# Rekursiv (mit Laplace), O(n!)
 start = time.time()
 det_lap = det_laplace(A)
 print(f"Det(Laplace) = {det_lap}, Zeit: {time.time() - start:.4f} s")
@@ -0,0 +1,266 @@
+'''
+Skalierungs-Benchmark der Determinantenverfahren (Erweiterung von Aufgabe 8).
+
+Für jede Methode wird die Determinante der Hilbert-Matrix H_N für wachsende
+N gemessen: erst ein Aufwärmlauf, dann mehrere Wiederholungen mit
+time.perf_counter (Median und Minimum). Jede Messung läuft in einem eigenen
+Prozess; dauert ein einzelner Aufruf länger als timeout Sekunden, wird der
+Prozess beendet und die Methode scheidet für alle größeren N aus. Lässt die
+Laufzeit der letzten beiden Messungen schon eine Überschreitung erwarten,
+wird gar nicht erst gemessen. So fallen exponentielle Verfahren (Laplace)
+automatisch heraus, ohne den Lauf aufzuhalten.
+
+Die Genauigkeit wird mit der exakten Determinante (geschlossene Form, siehe
+determinants.hilbert_det) verglichen. Da det(H_N) schnell unter den
+float64-Bereich fällt, wird der log-relative Fehler |ln|d| - ln|d_exakt||
+angegeben (≈ relativer Fehler für kleine Werte, ∞ bei Unterlauf auf 0).
+
+Aus den FIT_POINTS größten Messungen oberhalb MIN_FIT_TIME wird pro Methode
+ein empirischer Exponent k mit t ≈ c · N^k geschätzt (Ausgleichsgerade in
+log-log; kleine N sind vom festen Aufwand dominiert und verfälschen k).
+Ergebnisse: JSON (mit Exponenten) und CSV (eine Zeile pro Messung).
+
+Aufruf:
+    python determinant_benchmark.py
+    python determinant_benchmark.py --methods numpy lu bareiss modular --sizes 10 20 40 80
+    python determinant_benchmark.py --timeout 30 -o det.json --csv det.csv
+'''
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import platform
+import statistics
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+from determinants import (det_bareiss, det_laplace, det_laplace_memo, det_lu,
+                          det_modular, hilbert, hilbert_det)
+from log_determinant import slogdet
+
+DEFAULT_SIZES = (2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 14, 16, 18, 20, 25, 30, 40,
+                 50, 60, 80, 100, 120, 160, 200)
+MIN_FIT_TIME = 1e-3  # kürzere Messungen sind vom Aufrufaufwand dominiert
+FIT_POINTS = 5       # Exponent aus den größten N (asymptotischer Bereich)
+
+
+def _sympy_matrix(n):
+    import sympy as sy
+    return sy.Matrix(n, n, lambda i, j: sy.Rational(1, i + j + 1))
+
+
+def _sympy_det(A):
+    d = A.det()
+    return Fraction(int(d.p), int(d.q))
+
+
+def _float_hilbert(n):
+    return np.array(hilbert(n), dtype=np.float64)
+
+
+def _slogdet(A):
+    result = slogdet(A)
+    return float(result['sign']), float(result['logabsdet'])
+
+
+# Methode: (Eingabe für N erzeugen – nicht gemessen, Determinante berechnen)
+METHODS = {
+    'numpy': (_float_hilbert, np.linalg.det),
+    'lu': (_float_hilbert, det_lu),
+    'slogdet': (_float_hilbert, _slogdet),
+    'sympy': (_sympy_matrix, _sympy_det),
+    'laplace': (hilbert, det_laplace),
+    'laplace_memo': (hilbert, det_laplace_memo),
+    'bareiss': (hilbert, det_bareiss),
+    'modular': (hilbert, det_modular),
+}
+
+
+# (Vorzeichen, ln|d|) für int, Fraction, float und (Vorzeichen, ln|d|) selbst
+def sign_log(value):
+    if isinstance(value, tuple):
+        return value
+    if value == 0:
+        return 0.0, -math.inf
+    sign = 1.0 if value > 0 else -1.0
+    if isinstance(value, (int, Fraction)):
+        value = Fraction(value)
+        return sign, math.log(abs(value.numerator)) - math.log(value.denominator)
+    return sign, math.log(abs(float(value)))
+
+
+# Kindprozess: Aufwärmen, dann messen; Ergebnis über die Pipe zurück
+def _measure(conn, name, n, warmup, repeats, timeout):
+    prepare, compute = METHODS[name]
+    A = prepare(n)
+    for _ in range(warmup):
+        start = time.perf_counter()
+        value = compute(A)
+        if time.perf_counter() - start > timeout:
+            # schon der Aufwärmlauf ist zu langsam: nur diese Zeit melden
+            conn.send(([time.perf_counter() - start], value))
+            return
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        value = compute(A)
+        times.append(time.perf_counter() - start)
+    conn.send((times, value))
+
+
+# Eine Messung mit harter Zeitgrenze; None bei Zeitüberschreitung
+def run_case(name, n, warmup=1, repeats=3, timeout=10.0):
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_measure,
+                                      args=(sender, name, n, warmup, repeats, timeout))
+    process.start()
+    sender.close()
+    try:
+        if receiver.poll(timeout * (warmup + repeats) + 5.0):
+            return receiver.recv()
+        return None
+    finally:
+        process.terminate()
+        process.join()
+
+
+# Prognose der nächsten Laufzeit aus den letzten beiden Messungen (lokaler Exponent)
+def predict_time(points, n):
+    fit = [(m, t) for m, t in points if t >= MIN_FIT_TIME]
+    if len(fit) < 2:
+        return None
+    (n1, t1), (n2, t2) = fit[-2:]
+    k = max(math.log(t2 / t1) / math.log(n2 / n1), 1.0)
+    return t2 * (n / n2)**k
+
+
+# Empirischer Exponent k aus t ≈ c · N^k (mindestens 3 Messungen über MIN_FIT_TIME)
+def fit_exponent(points):
+    fit = [(n, t) for n, t in points if t >= MIN_FIT_TIME][-FIT_POINTS:]
+    if len(fit) < 3:
+        return None
+    n, t = np.log(np.array(fit)).T
+    return float(np.polyfit(n, t, 1)[0])
+
+
+# Alle Methoden über alle Größen; progress(zeile) wird nach jeder Messung aufgerufen
+def run_benchmark(methods, sizes, warmup=1, repeats=3, timeout=10.0, progress=None):
+    rows = []
+    exponents = {}
+    references = {}
+    for name in methods:
+        points = []
+        for n in sorted(sizes):
+            row = {'method': name, 'n': n, 'status': 'ok', 'median': None, 'min': None,
+                   'repeats': 0, 'log_rel_error': None, 'sign_ok': None}
+            predicted = predict_time(points, n)
+            result = None
+            if predicted is not None and predicted > timeout:
+                row['status'] = 'prognose'
+            else:
+                result = run_case(name, n, warmup, repeats, timeout)
+                if result is None:
+                    row['status'] = 'timeout'
+
+            if result is not None:
+                times, value = result
+                row.update(median=statistics.median(times), min=min(times), repeats=len(times))
+                if n not in references:
+                    references[n] = hilbert_det(n)
+                sign, log_value = sign_log(value)
+                error = abs(log_value - sign_log(references[n])[1])
+                row['log_rel_error'] = error if math.isfinite(error) else None
+                row['sign_ok'] = bool(sign > 0) if sign != 0 else None  # det(H_N) > 0
+                if row['median'] > timeout:
+                    row['status'] = 'timeout'
+                points.append((n, row['median']))
+
+            rows.append(row)
+            if progress:
+                progress(row)
+            if row['status'] != 'ok':
+                break  # Methode scheidet für größere N aus
+        exponents[name] = {'exponent': fit_exponent(points),
+                           'points': min(FIT_POINTS, sum(t >= MIN_FIT_TIME for _, t in points)),
+                           'max_n': max((m for m, _ in points), default=None)}
+
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'settings': {'sizes': sorted(sizes), 'warmup': warmup, 'repeats': repeats,
+                     'timeout': timeout, 'matrix': 'hilbert'},
+        'results': rows,
+        'exponents': exponents,
+    }
+
+
+def write_csv(path, benchmark):
+    fields = ['method', 'n', 'status', 'median', 'min', 'repeats', 'log_rel_error', 'sign_ok']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(benchmark['results'])
+
+
+def _format_row(row):
+    if row['median'] is None:
+        return f"{row['method']:>13s} N={row['n']:4d}: {row['status']}"
+    error = row['log_rel_error']
+    error = 'Unterlauf' if error is None else f"{error:.2e}"
+    text = (f"{row['method']:>13s} N={row['n']:4d}: {row['median']:10.4f} s "
+            f"(min {row['min']:.4f} s), log-rel. Fehler {error}")
+    if row['sign_ok'] is False:
+        text += ', falsches Vorzeichen'
+    if row['status'] != 'ok':
+        text += f" [{row['status']}]"
+    return text
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Skalierungs-Benchmark der Determinantenverfahren.")
+    parser.add_argument('--methods', nargs='+', choices=list(METHODS), default=list(METHODS),
+                        help="zu messende Verfahren")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES),
+                        help="Matrixgrößen N")
+    parser.add_argument('--warmup', type=int, default=1, help="Aufwärmläufe pro Messung")
+    parser.add_argument('--repeats', type=int, default=3, help="Wiederholungen pro Messung")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="Zeitgrenze pro Aufruf in Sekunden")
+    parser.add_argument('-o', '--output', default='determinant_benchmark.json',
+                        help="JSON-Ausgabe")
+    parser.add_argument('--csv', default='determinant_benchmark.csv', help="CSV-Ausgabe")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    methods = list(args.methods)
+    if 'sympy' in methods:
+        try:
+            import sympy  # noqa: F401
+        except ImportError:
+            print("SymPy nicht installiert – Methode 'sympy' entfällt.")
+            methods.remove('sympy')
+
+    benchmark = run_benchmark(methods, args.sizes, args.warmup, args.repeats, args.timeout,
+                              progress=lambda row: print(_format_row(row), flush=True))
+
+    print("\nEmpirische Exponenten (t ≈ c · N^k):")
+    for name, fit in benchmark['exponents'].items():
+        k = 'zu wenige Messungen' if fit['exponent'] is None else f"k = {fit['exponent']:.2f}"
+        print(f"{name:>13s}: {k} (bis N = {fit['max_n']})")
+
+    with open(args.output, 'w') as f:
+        json.dump(benchmark, f, indent=2)
+    write_csv(args.csv, benchmark)
+    print(f"\nErgebnisse: {args.output}, {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+'''
+Determinanten ohne SymPy-Matrizen (Erweiterung von Aufgabe 8).
+
+Verfahren, die auf einfachen Listen von Listen oder NumPy-Arrays arbeiten
+(Einträge: int, Fraction oder float):
+
+    det_laplace        Laplace-Entwicklung nach der ersten Zeile, rekursiv,
+                       Aufwand O(n!) (Referenz aus Aufgabe 8).
+    det_laplace_memo   Laplace-Entwicklung mit Zwischenspeicher. Jede
+                       Unterdeterminante der letzten k Zeilen hängt nur von
+                       der Menge der verbleibenden Spalten ab (Bitmaske), es
+                       gibt also nur 2ⁿ verschiedene statt n! Aufrufe:
+                       Aufwand O(n·2ⁿ).
+    det_bareiss        Bruchfreie Gauß-Elimination nach Bareiss mit ganzen
+                       Python-Zahlen. Alle Divisionen gehen auf, die
+                       Zwischenwerte sind Unterdeterminanten, daher exakt in
+                       O(n³) Operationen. Brüche werden vorher zeilenweise
+                       mit dem kgV der Nenner auf ganze Zahlen gebracht.
+    det_lu             LU-Zerlegung mit Spaltenpivotsuche in float64.
+    det_modular        Exakt über viele Primzahlen p < 2²³ (siehe unten).
+
+Multimodulare Determinante: Jeder Eintrag a/b wird direkt modulo p
+abgebildet (a · b⁻¹ mod p), die Gauß-Elimination läuft vektorisiert für
+einen ganzen Stapel von Primzahlen zugleich. Gerechnet wird in float64 mit
+symmetrischen Resten |r| ≤ p/2: Produkte bleiben unter 2⁴⁴ und sind exakt,
+Summen von PANEL Produkten ebenso. Die Elimination ist daher geblockt: PANEL
+Spalten werden einzeln eliminiert, der Restblock wird danach mit einem
+einzigen gestapelten Matrixprodukt (BLAS) aktualisiert und erst dann
+reduziert. Die Stapel werden auf einen Prozesspool verteilt.
+
+Mit S = Π kgV der Zeilennenner ist D = S · det(A) eine ganze Zahl; ihre Reste
+werden mit dem chinesischen Restsatz zusammengesetzt. Die Hadamard-Schranke
+|D| ≤ Π S_i ‖a_i‖₂ legt fest, wie viele Primzahlen nötig sind.
+'''
+import math
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+
+import numpy as np
+
+PRIME_LIMIT = 1 << 23      # Primzahlen p < 2²³: Produkte exakt in float64
+PRIMES_PER_TASK = 64       # Primzahlen pro Stapel (ein Auftrag im Prozesspool)
+PANEL = 32                 # Blockbreite der Elimination (Spalten pro Matrixprodukt)
+
+
+# Beispielmatrix: Hilbert-Matrix mit exakten Brüchen 1/(i+j+1)
+def hilbert(n):
+    return [[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)]
+
+
+# Exakte Determinante der Hilbert-Matrix: c_n⁴ / c_2n mit c_n = 1! 2! ... (n-1)!
+def hilbert_det(n):
+    def c(m):
+        return math.prod(math.factorial(i) for i in range(1, m))
+    return Fraction(c(n)**4, c(2 * n))
+
+
+# Matrix als Liste von Zeilen (Listen) mit Python-Zahlen
+def _rows(A):
+    if isinstance(A, np.ndarray):
+        return A.tolist()
+    return [list(row) for row in A]
+
+
+# Laplace-Entwicklung nach der ersten Zeile, rekursiv über alle Minoren
+def det_laplace(A):
+    a = _rows(A)
+    n = len(a)
+    if n == 0:
+        return 1
+    if n == 1:
+        return a[0][0]
+    det = 0
+    for j in range(n):
+        if a[0][j]:
+            minor = [row[:j] + row[j + 1:] for row in a[1:]]
+            det += (-1)**j * a[0][j] * det_laplace(minor)
+    return det
+
+
+# Laplace-Entwicklung nach der ersten Zeile, Unterdeterminanten nach Spaltenmaske gespeichert
+def det_laplace_memo(A):
+    a = _rows(A)
+    n = len(a)
+    if n == 0:
+        return 1
+
+    # det_sub[mask]: Determinante der letzten popcount(mask) Zeilen mit den Spalten in mask
+    det_sub = [0] * (1 << n)
+    det_sub[0] = 1
+    for mask in range(1, 1 << n):
+        row = a[n - bin(mask).count('1')]
+        total = 0
+        sign = 1
+        # Spalten von links nach rechts, Vorzeichen wechselt mit jeder Spalte in mask
+        for j in range(n):
+            bit = 1 << j
+            if mask & bit:
+                if row[j]:
+                    total += sign * row[j] * det_sub[mask ^ bit]
+                sign = -sign
+        det_sub[mask] = total
+    return det_sub[(1 << n) - 1]
+
+
+# Zeile mit dem kgV ihrer Nenner multiplizieren: (ganzzahlige Zeile, Faktor)
+def _integer_row(row):
+    values = [Fraction(x) for x in row]
+    scale = 1
+    for x in values:
+        scale = scale * int(x.denominator) // math.gcd(scale, int(x.denominator))
+    return [int(x * scale) for x in values], scale
+
+
+# Bruchfreie Bareiss-Elimination, exaktes Ergebnis als int oder Fraction
+def det_bareiss(A):
+    a, scale = [], 1
+    for row in _rows(A):
+        integer_row, factor = _integer_row(row)
+        a.append(integer_row)
+        scale *= factor
+    n = len(a)
+
+    sign = 1
+    previous = 1
+    for k in range(n - 1):
+        if a[k][k] == 0:
+            # Zeilentausch mit einer Zeile, deren Eintrag in Spalte k nicht 0 ist
+            for i in range(k + 1, n):
+                if a[i][k] != 0:
+                    a[k], a[i] = a[i], a[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+        pivot = a[k][k]
+        row_k = a[k]
+        for i in range(k + 1, n):
+            row_i = a[i]
+            factor = row_i[k]
+            # a_ij ← (a_kk a_ij - a_ik a_kj) / a_{k-1,k-1}, Division geht auf
+            a[i] = row_i[:k + 1] + [
+                (pivot * row_i[j] - factor * row_k[j]) // previous
+                for j in range(k + 1, n)
+            ]
+        previous = pivot
+
+    det = Fraction(sign * a[n - 1][n - 1], scale) if n else Fraction(1)
+    return det.numerator if det.denominator == 1 else det
+
+
+# LU-Zerlegung mit Spaltenpivotsuche in float64: det = ±Π uᵢᵢ
+def det_lu(A):
+    U = np.array(A, dtype=np.float64)
+    n = U.shape[0]
+    det = 1.0
+    for k in range(n):
+        p = k + int(np.argmax(np.abs(U[k:, k])))
+        if U[p, k] == 0.0:
+            return 0.0
+        if p != k:
+            U[[k, p]] = U[[p, k]]
+            det = -det
+        det *= U[k, k]
+        # Rang-1-Aktualisierung des Restblocks
+        U[k + 1:, k + 1:] -= np.outer(U[k + 1:, k] / U[k, k], U[k, k + 1:])
+    return det
+
+
+# Kleine Primzahlen bis limit (Sieb des Eratosthenes)
+def _small_primes(limit):
+    sieve = np.ones(limit + 1, dtype=bool)
+    sieve[:2] = False
+    for q in range(2, math.isqrt(limit) + 1):
+        if sieve[q]:
+            sieve[q * q::q] = False
+    return np.nonzero(sieve)[0]
+
+
+# count Primzahlen unterhalb von PRIME_LIMIT, absteigend (segmentiertes Sieb)
+def word_primes(count, segment=1 << 20):
+    small = _small_primes(math.isqrt(PRIME_LIMIT) + 1)
+    primes = []
+    high = PRIME_LIMIT
+    while len(primes) < count:
+        low = high - segment
+        sieve = np.ones(segment, dtype=bool)
+        for q in small:
+            start = (-low) % q
+            sieve[start::q] = False
+        primes.extend((low + np.nonzero(sieve)[0])[::-1].tolist())
+        high = low
+    return np.array(primes[:count], dtype=np.int64)
+
+
+# Vektorisiert: x^e mod p für int64-Arrays x, e, p
+def _pow_mod(x, e, p):
+    result = np.ones_like(x)
+    x = x % p
+    e = e.copy()
+    while np.any(e > 0):
+        odd = (e & 1) == 1
+        result = np.where(odd, result * x % p, result)
+        x = x * x % p
+        e >>= 1
+    return result
+
+
+# Symmetrischer Rest x mod p, |r| ≤ p/2, für ganzzahlige float64-Werte |x| < 2⁵³
+def _mod(x, p):
+    # x - rint(x/p)·p ist exakt, 0 bleibt 0 (wichtig für die Pivotsuche)
+    return x - np.rint(x * (1.0 / p)) * p
+
+
+# Einträge num/den modulo jeder Primzahl: Stapel (Primzahlen, n, n) in float64
+def _reduce_entries(num, den, primes):
+    p = primes[:, np.newaxis]
+    # nur die verschiedenen Einträge reduzieren: a/b ≡ a · b^(p-2) mod p
+    pairs, index = np.unique(np.stack([num.ravel(), den.ravel()], axis=1), axis=0,
+                             return_inverse=True)
+    b = pairs[:, 1] % p
+    values = (pairs[:, 0] % p) * _pow_mod(b, np.broadcast_to(p - 2, b.shape), p) % p
+    return _mod(values.astype(np.float64), p.astype(np.float64))[:, index.reshape(num.shape)]
+
+
+# Determinante der Matrix num/den modulo jeder Primzahl eines Stapels
+def det_mod_primes(num, den, primes, panel=PANEL):
+    a = _reduce_entries(num, den, primes)
+    count, n, _ = a.shape
+    p = primes.astype(np.float64)
+    p2 = p[:, np.newaxis]
+    stack = np.arange(count)
+    det = np.ones(count, dtype=np.int64)
+
+    for k0 in range(0, n, panel):
+        k1 = min(k0 + panel, n)
+        # Spalten k0..k1-1 eliminieren, Multiplikatoren (L) unter der Diagonale ablegen
+        for k in range(k0, k1):
+            a[:, k:, k] = _mod(a[:, k:, k], p2)
+            nonzero = a[:, k:, k] != 0
+            pivot_row = k + np.argmax(nonzero, axis=1)
+            det[~nonzero.any(axis=1)] = 0
+            swap = pivot_row != k
+            if np.any(swap):
+                rows_k = a[stack, k].copy()
+                a[stack, k] = a[stack, pivot_row]
+                a[stack, pivot_row] = rows_k
+                det = np.where(swap, (primes - det) % primes, det)
+            a[:, k, k + 1:k1] = _mod(a[:, k, k + 1:k1], p2)
+
+            pivot = a[:, k, k].astype(np.int64)
+            det = det * pivot % primes
+            inverse = np.array([pow(x, -1, q) if x else 0
+                                for x, q in zip(pivot.tolist(), primes.tolist())], dtype=np.float64)
+            a[:, k + 1:, k] = _mod(a[:, k + 1:, k] * inverse[:, np.newaxis], p2)
+            a[:, k + 1:, k + 1:k1] -= a[:, k + 1:, k, np.newaxis] * a[:, k, np.newaxis, k + 1:k1]
+        if k1 == n:
+            break
+
+        # Zeilen k0..k1-1 rechts vom Block: U12 = L11⁻¹ A12 (Vorwärtseinsetzen)
+        for k in range(k0, k1):
+            a[:, k, k1:] = _mod(a[:, k, k1:], p2)
+            a[:, k + 1:k1, k1:] -= a[:, k + 1:k1, k, np.newaxis] * a[:, k, np.newaxis, k1:]
+
+        # Restblock: A22 ← A22 - L21 U12 (gestapeltes Matrixprodukt, BLAS)
+        a[:, k1:, k1:] -= np.matmul(a[:, k1:, k0:k1], a[:, k0:k1, k1:])
+        a[:, k1:, k1:] = _mod(a[:, k1:, k1:], p[:, np.newaxis, np.newaxis])
+    return det
+
+
+# Chinesischer Restsatz (Garner): kleinster symmetrischer Rest modulo Π p
+def crt(residues, primes):
+    x, modulus = 0, 1
+    for r, p in zip(residues.tolist(), primes.tolist()):
+        t = (r - x) * pow(modulus, -1, p) % p
+        x += modulus * t
+        modulus *= p
+    return x - modulus if x > modulus // 2 else x
+
+
+# Exakte Determinante mit mehreren Primzahlen (int oder Fraction)
+def det_modular(A, workers=None, primes_per_task=PRIMES_PER_TASK):
+    entries = [[Fraction(x) for x in row] for row in _rows(A)]
+    n = len(entries)
+    if n == 0:
+        return 1
+
+    num = np.array([[int(x.numerator) for x in row] for row in entries], dtype=object)
+    den = np.array([[int(x.denominator) for x in row] for row in entries], dtype=object)
+    if max(abs(num).max(), den.max()) >= 1 << 62:
+        raise ValueError("Zähler und Nenner müssen kleiner als 2^62 sein")
+    num, den = num.astype(np.int64), den.astype(np.int64)
+
+    # S = Π kgV der Zeilennenner; D = S · det(A) ist ganzzahlig
+    scales = [_integer_row(row)[1] for row in entries]
+    S = math.prod(scales)
+
+    # Hadamard: log2 |D| ≤ Σ log2(S_i ‖a_i‖₂)
+    bits = sum(
+        math.log2(scale) + 0.5 * math.log2(max(sum(float(x)**2 for x in row), 1e-300))
+        for scale, row in zip(scales, entries)
+    )
+    # Π p > 2 |D| (plus Reserve für Rundung). Primzahlen, die einen Nenner teilen,
+    # sind unbrauchbar; ein Nenner < 2⁶² hat höchstens zwei Primfaktoren > 2²².
+    denominators = np.unique(den)
+    candidates = word_primes(int((max(bits, 0) + 4) / 22) + 1 + 2 * len(denominators))
+    divides = np.zeros(len(candidates), dtype=bool)
+    for d in denominators.tolist():
+        divides |= d % candidates == 0
+    candidates = candidates[~divides]
+    needed = int(np.searchsorted(np.cumsum(np.log2(candidates)), bits + 4)) + 1
+    primes = candidates[:needed]
+
+    chunks = [primes[i:i + primes_per_task] for i in range(0, len(primes), primes_per_task)]
+    if workers == 1 or len(chunks) == 1:
+        residues = [det_mod_primes(num, den, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            residues = list(pool.map(det_mod_primes, [num] * len(chunks), [den] * len(chunks), chunks))
+    residues = np.concatenate(residues)
+
+    # Reste von D = S · det(A)
+    D_residues = residues * (np.array([S % int(p) for p in primes], dtype=np.int64)) % primes
+    det = Fraction(crt(D_residues, primes), S)
+    return det.numerator if det.denominator == 1 else det
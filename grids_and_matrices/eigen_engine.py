@@ -0,0 +1,176 @@
+'''
+Numerische Eigenwerte mit automatischer Genauigkeitsanpassung (Aufgabe 7).
+
+Statt charpoly/nroots/eigenvals in SymPy werden die Eigenwerte mit LAPACK in
+float64 berechnet (np.linalg.eig). Aus den rechten Eigenvektoren X und den
+Zeilen von X⁻¹ (linke Eigenvektoren) ergibt sich die Kondition jedes
+Eigenwerts
+
+    κᵢ = ‖xᵢ‖ · ‖(X⁻¹)ᵢ,:‖,
+
+und eine Störung der Größe ε‖A‖ verschiebt λᵢ um etwa κᵢ ε ‖A‖. Nur wenn
+diese Fehlerschätzung die gewünschte relative Genauigkeit rtol verfehlt,
+wird mit mpmath in so vielen Dezimalstellen neu gerechnet, wie κᵢ verlangt:
+für die Begleitmatrix über die Nullstellen des Polynoms (polyroots), sonst
+mit mp.eig. SymPy dient nur noch als optionale Referenz für kleine N.
+
+Die float64-Kondition ist bei großem κ selbst unzuverlässig (sie sättigt
+oder gehört zu einer ganz anderen Matrix, wenn schon das Runden der
+Einträge die Eigenwerte verschiebt). Das mpmath-Ergebnis wird deshalb mit
+doppelter Stellenzahl nachgerechnet und nur angenommen, wenn beide auf
+rtol übereinstimmen; sonst wird die Stellenzahl weiter verdoppelt. Die
+Fehlerschätzung ist die gemessene Abweichung zwischen den beiden Stufen.
+Für B = T⁻¹ A T gilt außerdem κ_B ≤ κ_A cond(T), was die float64-Kondition
+von B nach oben ergänzt.
+'''
+import math
+
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+GUARD_DIGITS = 10  # zusätzliche Stellen bei der Eskalation
+MIN_DPS = 30
+
+
+# Begleitmatrix: Einsen auf der Nebendiagonale, letzte Zeile zei
+def companion_matrix(zei):
+    N = len(zei)
+    A = np.zeros((N, N))
+    A[np.arange(N - 1), np.arange(1, N)] = 1.0
+    A[-1, :] = zei
+    return A
+
+
+# Koeffizienten des charakteristischen Polynoms λᴺ - zei[N-1] λᴺ⁻¹ - ... - zei[0]
+def companion_polynomial(zei):
+    return [1] + [-c for c in reversed(zei)]
+
+
+# Eigenwerte und Konditionszahlen κᵢ in float64
+def eigen_condition(A):
+    w, X = np.linalg.eig(A)
+    try:
+        Y = np.linalg.inv(X)
+    except np.linalg.LinAlgError:  # defekte Matrix: Eigenvektoren linear abhängig
+        return w, np.full(len(w), np.inf)
+    kappa = np.linalg.norm(X, axis=0) * np.linalg.norm(Y, axis=1)
+    return w, kappa
+
+
+# Nötige Dezimalstellen, damit κᵢ 10^(-dps) ‖A‖ ≤ rtol |λᵢ| für alle i
+def required_digits(w, kappa, norm, rtol, max_dps):
+    if not np.all(np.isfinite(kappa)):
+        return max_dps
+    scale = np.maximum(np.abs(w), norm * EPS)  # λ ≈ 0: absolut messen
+    digits = np.log10(kappa * norm / (rtol * scale))
+    return int(min(max_dps, max(MIN_DPS, math.ceil(digits.max()) + GUARD_DIGITS)))
+
+
+# Abstand jedes Eigenwerts aus values zum nächsten in reference und umgekehrt (max.)
+def _nearest_deviation(values, reference):
+    d = np.abs(values[:, np.newaxis] - reference[np.newaxis, :])
+    return d.min(axis=1), d.min(axis=0).max()
+
+
+# Eigenwerte mit Fehlerschätzung; high_precision(dps) liefert die mpmath-Eigenwerte.
+# condition_bound: obere Schranke für κ, falls die float64-Kondition unzuverlässig ist
+def adaptive_eigenvalues(A, rtol=1e-10, high_precision=None, max_dps=2000,
+                         condition_bound=None):
+    A = np.asarray(A, dtype=np.float64)
+    norm = np.linalg.norm(A, 2)
+    w, kappa = eigen_condition(A)
+    if condition_bound is not None:
+        kappa = np.maximum(kappa, condition_bound)
+    error = kappa * EPS * norm
+
+    result = {
+        'values': w,
+        'condition': kappa,
+        'error_estimate': error,
+        'precision': 'float64',
+        'dps': 16,
+    }
+    if np.all(error <= rtol * np.maximum(np.abs(w), norm * EPS)):
+        return result
+
+    if high_precision is None:
+        high_precision = lambda dps: _mp_eig(A, dps)
+    dps = required_digits(w, kappa, norm, rtol, max_dps)
+    values = np.array([complex(z) for z in high_precision(dps)])
+
+    # Kontrolle mit doppelter Stellenzahl, bis beide Stufen auf rtol übereinstimmen
+    while True:
+        check_dps = min(max_dps, 2 * dps)
+        check = np.array([complex(z) for z in high_precision(check_dps)])
+        deviation, reverse = _nearest_deviation(check, values)
+        scale = np.maximum(np.abs(check), norm * EPS)
+        if (np.all(deviation <= rtol * scale) and reverse <= rtol * scale.max()) \
+                or check_dps == max_dps:
+            break
+        values, dps = check, check_dps
+
+    # Konditionen den mpmath-Eigenwerten über den nächsten float64-Wert zuordnen
+    nearest = np.abs(check[:, np.newaxis] - w[np.newaxis, :]).argmin(axis=1)
+    result.update({
+        'values': check,
+        'condition': kappa[nearest],
+        'error_estimate': np.maximum(deviation, reverse),  # Abweichung zur Stufe mit dps Stellen
+        'precision': 'mpmath',
+        'dps': check_dps,
+    })
+    return result
+
+
+def _mp_eig(A, dps):
+    import mpmath as mp
+
+    with mp.workdps(dps):
+        return mp.eig(mp.matrix(A.tolist()), left=False, right=False)
+
+
+# Eigenwerte der Begleitmatrix zu zei (Eskalation: Nullstellen des Polynoms)
+def companion_eigenvalues(zei, rtol=1e-10, max_dps=2000):
+    def roots(dps):
+        import mpmath as mp
+
+        with mp.workdps(dps):
+            coefficients = [mp.mpf(c) for c in companion_polynomial(zei)]
+            return mp.polyroots(coefficients, maxsteps=50 * len(zei) + 100,
+                                extraprec=4 * dps)
+
+    return adaptive_eigenvalues(companion_matrix(zei), rtol, roots, max_dps)
+
+
+# Eigenwerte von B = T⁻¹ A T mit T = T_int / scale (Eskalation: B in mpmath)
+def similar_eigenvalues(A, T_int, scale=10.01, rtol=1e-10, max_dps=2000):
+    T = np.asarray(T_int) / scale
+    B = np.linalg.solve(T, A @ T)
+    # κ_B ≤ κ_A cond(T): die float64-Kondition des gerundeten B allein taugt nicht
+    bound = eigen_condition(A)[1].max() * np.linalg.cond(T)
+
+    def exact_similar(dps):
+        import mpmath as mp
+
+        with mp.workdps(dps):
+            Tm = mp.matrix(np.asarray(T_int).tolist()) / mp.mpf(str(scale))
+            Bm = mp.inverse(Tm) * mp.matrix(A.tolist()) * Tm
+            return mp.eig(Bm, left=False, right=False)
+
+    return B, adaptive_eigenvalues(B, rtol, exact_similar, max_dps, bound)
+
+
+# Optionale Referenz mit SymPy (langsam, nur für kleine N); None ohne SymPy
+def sympy_reference(zei):
+    try:
+        import sympy as sy
+    except ImportError:
+        return None
+    lam = sy.Symbol('lambda')
+    polynomial = sy.Poly(companion_polynomial(zei), lam)
+    return np.array([complex(z) for z in sy.nroots(polynomial.as_expr(), n=30, maxsteps=200)])
+
+
+# Hausdorff-Abstand zweier Eigenwertmengen: max. Abstand zum nächsten Partner
+def spectral_distance(a, b):
+    d = np.abs(np.asarray(a)[:, np.newaxis] - np.asarray(b)[np.newaxis, :])
+    return max(d.min(axis=1).max(), d.min(axis=0).max())
@@ -0,0 +1,159 @@
+'''
+Monte-Carlo-Studie zur Empfindlichkeit der Eigenwerte (Erweiterung von Aufgabe 7).
+
+Statt einer einzigen Zufallsmatrix T werden viele ähnliche Matrizen
+
+    B = T⁻¹ (A + δ ‖A‖_F E) T,    T = T_int / 10.01,  ‖E‖_F = 1,
+
+für mehrere Störungsniveaus δ untersucht. Die Matrizen werden als Stapel
+(batch, N, N) erzeugt; B entsteht mit np.linalg.solve (ohne explizite
+Inverse), die Eigenwerte mit dem gestapelten np.linalg.eigvals. Jede
+Eigenwertmenge wird vektorisiert den exakten Eigenwerten von A zugeordnet
+(gierig nach kleinstem Abstand, für alle Matrizen eines Stapels zugleich).
+
+Die Arbeit wird in Teilstücke fester Größe zerlegt, deren Zufallszahlen aus
+np.random.SeedSequence(seed).spawn stammen; die Ergebnisse hängen daher
+nicht von der Anzahl der Prozesse ab. Jedes Teilstück liefert nur laufende
+Statistiken (Anzahl, Mittelwert, Varianz, Maximum, Histogramm von log10 der
+Abweichung, Kondition von T), die Spektren werden nicht gespeichert.
+'''
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from eigen_engine import companion_eigenvalues, companion_matrix
+
+LOG_BINS = np.arange(-17.0, 3.01, 0.5)  # Histogramm für log10(Abweichung)
+
+
+# Laufende Statistik (Welford), zusammenführbar über Teilstücke
+class RunningStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.max = -np.inf
+        self.histogram = np.zeros(len(LOG_BINS) - 1, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        other = RunningStats()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean)**2).sum())
+        other.max = float(values.max())
+        logs = np.clip(np.log10(np.maximum(values, 1e-300)), LOG_BINS[0], LOG_BINS[-1])
+        other.histogram = np.histogram(logs, LOG_BINS)[0]
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.count = count
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+
+    def summary(self):
+        std = float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+        return {'count': self.count, 'mean': self.mean, 'std': std, 'max': self.max}
+
+
+# Zufällige Ähnlichkeitstransformationen T = T_int / scale als Stapel
+def random_similarity_stack(rng, count, N, scale=10.01):
+    return rng.integers(-10, 11, size=(count, N, N)) / scale
+
+
+# Gierige Zuordnung für alle Matrizen zugleich: Abweichung pro Matrix
+def match_deviation(values, reference):
+    # d[b, i, j] = |λ_b,i - λ_ref,j|
+    d = np.abs(values[:, :, np.newaxis] - reference[np.newaxis, np.newaxis, :])
+    batch, N, _ = d.shape
+    rows = np.arange(batch)
+    deviation = np.zeros(batch)
+    for _ in range(N):
+        flat = d.reshape(batch, -1).argmin(axis=1)
+        i, j = np.divmod(flat, N)
+        deviation = np.maximum(deviation, d[rows, i, j])
+        # zugeordnete Zeile und Spalte sperren
+        d[rows, i, :] = np.inf
+        d[rows, :, j] = np.inf
+    return deviation
+
+
+# Ein Teilstück: samples Matrizen für ein Störungsniveau, in Stapeln der Größe batch
+def study_shard(A, reference, level, seed, samples, batch=256):
+    rng = np.random.default_rng(seed)
+    N = A.shape[0]
+    norm = np.linalg.norm(A)
+    deviation, condition = RunningStats(), RunningStats()
+
+    for start in range(0, samples, batch):
+        count = min(batch, samples - start)
+        T = random_similarity_stack(rng, count, N)
+        E = rng.standard_normal((count, N, N))
+        E *= level * norm / np.linalg.norm(E, axis=(1, 2), keepdims=True)
+
+        # singuläre T (selten bei ganzzahligen Einträgen) überspringen
+        regular = np.linalg.matrix_rank(T) == N
+        T, E = T[regular], E[regular]
+        if len(T) == 0:
+            continue
+
+        B = np.linalg.solve(T, (A + E) @ T)  # B = T⁻¹ (A + E) T
+        values = np.linalg.eigvals(B)
+
+        deviation.update(match_deviation(values, reference))
+        condition.update(np.linalg.cond(T))
+
+    return level, deviation, condition
+
+
+# Gesamtstudie: Teilstücke über einen Prozesspool verteilen, Statistiken zusammenführen
+def run_study(zei, levels=(0.0, 1e-14, 1e-12, 1e-10, 1e-8), samples=10000,
+              shard_size=1000, batch=256, workers=None, seed=0):
+    A = companion_matrix(zei)
+    reference = companion_eigenvalues(zei)['values']
+
+    shards = -(-samples // shard_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(levels) * shards)
+    tasks = [
+        (level, seeds[k * shards + s], min(shard_size, samples - s * shard_size))
+        for k, level in enumerate(levels) for s in range(shards)
+    ]
+
+    results = {level: (RunningStats(), RunningStats()) for level in levels}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(study_shard, A, reference, level, seed_seq, n, batch)
+                   for level, seed_seq, n in tasks]
+        for future in futures:
+            level, deviation, condition = future.result()
+            results[level][0].merge(deviation)
+            results[level][1].merge(condition)
+
+    return {
+        level: {
+            'deviation': deviation.summary(),
+            'histogram': deviation.histogram,  # Klassen: LOG_BINS
+            'condition_T': condition.summary(),
+        }
+        for level, (deviation, condition) in results.items()
+    }
+
+
+if __name__ == "__main__":
+    zei = [-82944, -304128, -557568, -649344, -529168, -315264,
+           -140544, -47232, -11912, -2208, -288, -24]
+
+    start = time.perf_counter()
+    study = run_study(zei, samples=5000)
+    print(f"Laufzeit: {time.perf_counter() - start:.1f} s")
+    for level, r in study.items():
+        d, c = r['deviation'], r['condition_T']
+        print(f"δ = {level:7.0e}: max. Abweichung {d['max']:.3e}, "
+              f"Mittel {d['mean']:.3e} ± {d['std']:.1e}, "
+              f"mittlere Kondition von T {c['mean']:.1e} ({d['count']} Matrizen)")
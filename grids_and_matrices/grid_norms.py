@@ -0,0 +1,161 @@
+'''
+Gitterpunkte und Normen – vektorisierte Klassifikation für Aufgabe 4.
+
+Die Gitterpunkte (i·h, j·h) mit i, j = -M, ..., M und h = 1/M werden nicht als
+Liste von Punkten erzeugt, sondern blockweise aus np.arange mit Broadcasting.
+Für jeden Block entsteht pro Norm eine boolesche Maske |(i, j)|_p ≤ M, also
+|(x, y)|_p ≤ 1. Geprüft wird mit ganzen Zahlen (|i| + |j| ≤ M, i² + j² ≤ M²,
+max(|i|, |j|) ≤ M), so dass Punkte genau auf dem Rand nicht durch
+Rundungsfehler falsch einsortiert werden.
+
+Da alle Normkugeln konvex und symmetrisch sind, liegen die inneren Punkte
+einer Zeile i genau bei |j| ≤ w_i. Die Halbbreiten w_i sind die kompakte
+Darstellung (2M+1 Zahlen statt (2M+1)² Punkte); daraus folgen Anzahlen,
+Masken und Indizes.
+
+Der Speicherbedarf ist durch chunk_points begrenzt, M = 10000 (10⁸ Punkte)
+läuft damit in wenigen Sekunden.
+
+Zum Zeichnen werden die Punkte nicht als einzelne Marker geplottet, sondern
+zu einem Pixelraster zusammengefasst: jedes Pixel erhält den Anteil der
+Gitterpunkte in ihm, die innerhalb der Normkugel liegen (ein imshow pro
+Norm, dazu der exakte Rand |x|^p + |y|^p = 1 als geglättete Linie). Die
+Zeichenzeit hängt damit nicht mehr von M ab.
+'''
+import numpy as np
+
+NORMS = (1, 2, np.inf)
+CHUNK_POINTS = 1 << 22  # Punkte pro Block (Masken von einigen MB)
+
+
+# Ganzzahliger Test |i|^p + |j|^p ≤ M^p (bzw. max(|i|, |j|) ≤ M für p = ∞)
+def norm_mask(i, j, M, p):
+    ai, aj = np.abs(i), np.abs(j)
+    if p == np.inf:
+        return np.maximum(ai, aj) <= M
+    if p == 1:
+        return ai + aj <= M
+    if float(p).is_integer() and 2 * M**int(p) < 2**63:
+        p = int(p)
+        return ai**p + aj**p <= M**p
+    # Nicht ganzzahliges (oder sehr großes) p: Gleitkommatest
+    return (ai / M)**p + (aj / M)**p <= 1.0
+
+
+# Zeilenblöcke des Gitters: (i-Werte als Spalte, j-Werte als Zeile)
+def iter_grid_chunks(M, chunk_points=CHUNK_POINTS):
+    n = 2 * M + 1
+    rows = max(1, chunk_points // n)
+    j = np.arange(-M, M + 1, dtype=np.int64)[np.newaxis, :]
+    for start in range(-M, M + 1, rows):
+        i = np.arange(start, min(start + rows, M + 1), dtype=np.int64)[:, np.newaxis]
+        yield i, j
+
+
+# Masken blockweise: liefert (i-Werte, Maske) für jeden Block
+def iter_norm_masks(M, p, chunk_points=CHUNK_POINTS):
+    for i, j in iter_grid_chunks(M, chunk_points):
+        yield i[:, 0], norm_mask(i, j, M, p)
+
+
+# Halbbreiten w_i: Zeile i enthält die inneren Punkte |j| ≤ w_i (w_i = -1: keine)
+def row_widths(M, p, chunk_points=CHUNK_POINTS):
+    widths = np.empty(2 * M + 1, dtype=np.int64)
+    for i, mask in iter_norm_masks(M, p, chunk_points):
+        widths[i + M] = (np.count_nonzero(mask, axis=1) - 1) // 2
+    return widths
+
+
+# Anzahl der Punkte innerhalb und außerhalb der Einheitskugel jeder Norm
+def classify(M, norms=NORMS, chunk_points=CHUNK_POINTS):
+    total = (2 * M + 1)**2
+    result = {}
+    for p in norms:
+        widths = row_widths(M, p, chunk_points)
+        inside = int(np.sum(2 * widths + 1))
+        result[p] = {'inside': inside, 'outside': total - inside, 'widths': widths}
+    return result
+
+
+# Vollständige Maske (2M+1)×(2M+1), Zeile = i, Spalte = j (nur für kleine M)
+def grid_mask(M, p):
+    widths = row_widths(M, p)
+    j = np.arange(-M, M + 1)
+    return np.abs(j)[np.newaxis, :] <= widths[:, np.newaxis]
+
+
+# Indizes (i, j) der inneren Punkte aus den Halbbreiten
+def inside_indices(widths):
+    M = (len(widths) - 1) // 2
+    counts = np.maximum(2 * widths + 1, 0)
+    i = np.repeat(np.arange(-M, M + 1), counts)
+    # j läuft in jeder Zeile von -w_i bis w_i
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    j = offsets - np.repeat(widths, counts)
+    return i, j
+
+
+# Pixelraster: Anteil der inneren Gitterpunkte pro Pixel, Zeile = y, Spalte = x
+def rasterize(M, p, resolution=800, chunk_points=CHUNK_POINTS):
+    n = 2 * M + 1
+    res = min(resolution, n)
+    widths = row_widths(M, p, chunk_points)
+
+    # Pixel c enthält die Indizes edges[c], ..., edges[c+1] - 1 (verschoben um -M)
+    edges = (np.arange(res + 1) * n) // res - M
+    lo, hi = edges[:-1], edges[1:] - 1
+
+    inside = np.zeros((res, res), dtype=np.int64)
+    rows = max(1, chunk_points // res)
+    for start in range(0, n, rows):
+        w = widths[start:start + rows, np.newaxis]
+        # Schnitt des Intervalls [-w_i, w_i] mit den Pixelspalten
+        counts = np.clip(np.minimum(hi, w) - np.maximum(lo, -w) + 1, 0, None)
+        pixel_rows = np.searchsorted(edges, np.arange(start, start + len(w)) - M, side='right') - 1
+        np.add.at(inside, pixel_rows, counts)
+
+    sizes = np.diff(edges)
+    fraction = inside / (sizes[:, np.newaxis] * sizes[np.newaxis, :])
+    # inside[a, b]: a gehört zu i (x), b zu j (y) → transponieren für imshow
+    return fraction.T
+
+
+# Rand der Einheitskugel |x|^p + |y|^p = 1 als Polygon
+def unit_ball_boundary(p, samples=1000):
+    t = np.linspace(0, 2 * np.pi, samples)
+    c, s = np.cos(t), np.sin(t)
+    if p == np.inf:
+        scale = np.maximum(np.abs(c), np.abs(s))
+        return c / scale, s / scale
+    return np.sign(c) * np.abs(c)**(2 / p), np.sign(s) * np.abs(s)**(2 / p)
+
+
+# Eine Norm zeichnen: Raster (rot = innen, blau = außen) und Rand
+def plot_norm_raster(ax, M, p, resolution=800, label=None):
+    from matplotlib.colors import LinearSegmentedColormap
+    from matplotlib.patches import Patch
+
+    h = 1 / M
+    cmap = LinearSegmentedColormap.from_list('norm', ['blue', 'red'])
+    extent = [-1 - h / 2, 1 + h / 2, -1 - h / 2, 1 + h / 2]
+    ax.imshow(rasterize(M, p, resolution), origin='lower', extent=extent,
+              cmap=cmap, vmin=0, vmax=1, interpolation='antialiased')
+
+    x, y = unit_ball_boundary(p)
+    ax.plot(x, y, color='black', linewidth=1)
+
+    label = label or f'|x|_{p}'
+    ax.legend(handles=[Patch(color='red', label=f'{label} ≤ 1'),
+                       Patch(color='blue', label=f'{label} > 1')],
+              loc='upper right')
+
+
+if __name__ == "__main__":
+    import time
+
+    for M in (400, 10000):
+        start = time.perf_counter()
+        result = classify(M)
+        print(f"M = {M}: " + ", ".join(
+            f"p={p}: {r['inside']} innen" for p, r in result.items()
+        ) + f" ({time.perf_counter() - start:.2f} s)")
@@ -0,0 +1,174 @@
+'''
+Gitterpunkte in p-Normkugeln in n Dimensionen (n = 3, ..., 8).
+
+Gezählt werden die Punkte x = h·i mit i ∈ ℤⁿ, h = 1/M und |x|_p ≤ 1, also
+Σ |i_k|^p ≤ M^p. Das ist die n-dimensionale Verallgemeinerung von Aufgabe 4
+(grid_norms.py). Für ganzzahliges p wird exakt mit ganzen Zahlen gerechnet:
+in int64, solange M^p < 2^62, sonst mit Python-Ganzzahlen (Objekt-Arrays,
+langsamer, aber ohne Überlauf).
+
+Statt (2M+1)ⁿ Punkte aufzuzählen, wird die Symmetrie der Normkugel genutzt:
+es genügen die sortierten Tupel M ≥ a₁ ≥ a₂ ≥ ... ≥ aₙ ≥ 0 aus dem ersten
+Orthanten. Jedes steht für
+
+    n! / (r₁! r₂! ...) · 2^(Anzahl aₖ ≠ 0)
+
+Punkte (Permutationen mal Vorzeichen, rⱼ = Längen der Läufe gleicher Werte).
+Die Tupel werden Koordinate für Koordinate aufgebaut; alle Teiltupel einer
+Stufe liegen in NumPy-Arrays (Restbudget M^p - Σ aₖ^p, letzter Wert,
+Lauflänge, Gewicht) und werden blockweise vektorisiert erweitert. Die letzte
+Koordinate wird nicht aufgezählt, sondern in geschlossener Form summiert.
+Die Werte der ersten Koordinate werden auf einen Prozesspool verteilt.
+
+Das Volumen der Einheitskugel ist
+
+    V_n,p = (2 Γ(1 + 1/p))ⁿ / Γ(1 + n/p),
+
+die Schätzung Anzahl·hⁿ konvergiert für M → ∞ dagegen.
+'''
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+CHUNK_STATES = 1 << 20  # Teiltupel pro Block
+
+
+# Exaktes Volumen der Einheitskugel der p-Norm in n Dimensionen
+def ball_volume(n, p):
+    if p == np.inf:
+        return 2.0**n
+    return (2 * math.gamma(1 + 1 / p))**n / math.gamma(1 + n / p)
+
+
+def _is_integer_power(p):
+    return p != np.inf and float(p).is_integer()
+
+
+# Ganzzahliges p, aber M^p passt nicht sicher in int64: Python-Ganzzahlen verwenden
+def _needs_objects(M, p):
+    return _is_integer_power(p) and M**int(p) >= 2**62
+
+
+# Budget M^p (ganzzahlig für ganzzahliges p, sonst Gleitkomma)
+def _budget(M, p):
+    if p == np.inf:
+        return 0
+    if _is_integer_power(p):
+        return M**int(p)
+    return float(M)**p
+
+
+def _power(v, p, M):
+    if _needs_objects(M, p):
+        return np.asarray(v).astype(object)**int(p)
+    if _is_integer_power(p):
+        return v**int(p)
+    return v.astype(np.float64)**p
+
+
+# Größter Wert v ≥ 0 mit v^p ≤ R (für p = ∞ immer M)
+def _max_coordinate(R, p, M):
+    if p == np.inf:
+        return np.full(len(R), M, dtype=np.int64)
+    v = np.floor(np.power(np.maximum(R, 0).astype(np.float64), 1 / p)).astype(np.int64)
+    v = np.minimum(v, M)
+    if _is_integer_power(p):
+        # Rundungsfehler der Wurzel korrigieren
+        for _ in range(2):
+            v -= (_power(v, p, M) > R).astype(bool)
+            v += (v < M) & (_power(v + 1, p, M) <= R).astype(bool)
+    return v
+
+
+# Teiltupel um eine Koordinate erweitern: Werte 0, ..., min(letzter Wert, Maximum)
+def _expand(R, last, run, weight, p, M):
+    top = np.minimum(last, _max_coordinate(R, p, M))
+    counts = top + 1
+    parent = np.repeat(np.arange(len(R)), counts)
+    # v läuft für jedes Teiltupel von 0 bis top
+    v = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    same = v == last[parent]
+    new_run = np.where(same, run[parent] + 1, 1)
+    # Gewicht: Permutationen / (Lauflänge)! und Faktor 2 für v ≠ 0
+    new_weight = np.where(same, weight[parent] // new_run, weight[parent]) * np.where(v > 0, 2, 1)
+    return R[parent] - _power(v, p, M), v, new_run, new_weight
+
+
+# Letzte Koordinate in geschlossener Form summieren
+def _final_sum(R, last, run, weight, p, M):
+    top = np.minimum(last, _max_coordinate(R, p, M))
+    # v = 0 (sofern 0 < last), v = 1, ..., min(top, last - 1) mit Faktor 2,
+    # v = last (sofern top = last) mit Gewicht / (run + 1)
+    zero = np.where(last > 0, weight, 0)
+    middle = 2 * weight * np.clip(np.minimum(top, last - 1), 0, None)
+    equal = np.where(top == last, weight // (run + 1) * np.where(last > 0, 2, 1), 0)
+    return int(zero.sum()) + int(middle.sum()) + int(equal.sum())
+
+
+def _count_level(R, last, run, weight, level, n, p, M, chunk_states):
+    if level == n - 1:
+        return _final_sum(R, last, run, weight, p, M)
+
+    total = 0
+    # Blöcke so wählen, dass jeder höchstens etwa chunk_states Nachfolger hat
+    children = np.cumsum(np.minimum(last, _max_coordinate(R, p, M)) + 1)
+    bounds = np.searchsorted(children, np.arange(chunk_states, children[-1], chunk_states))
+    for part in np.split(np.arange(len(R)), np.unique(bounds)):
+        if len(part) == 0:
+            continue
+        states = _expand(R[part], last[part], run[part], weight[part], p, M)
+        total += _count_level(*states, level + 1, n, p, M, chunk_states)
+    return total
+
+
+# Anzahl aller Punkte mit größter Koordinate |i|_max = a1 (eine Aufgabe für den Pool)
+def count_slice(n, p, M, a1, chunk_states=CHUNK_STATES):
+    R = np.array([_budget(M, p) - _power(np.int64(a1), p, M)],
+                 dtype=object if _needs_objects(M, p) else None)
+    weight = math.factorial(n) * (2 if a1 > 0 else 1)
+    states = (R, np.array([a1], dtype=np.int64), np.array([1], dtype=np.int64),
+              np.array([weight], dtype=np.int64))
+    if n == 1:
+        return weight // math.factorial(n)
+    return _count_level(*states, 1, n, p, M, chunk_states)
+
+
+# Gitterpunkte von h·ℤⁿ (h = 1/M) in der Einheitskugel der p-Norm
+def count_lattice_points(n, p, M, workers=None, chunk_states=CHUNK_STATES):
+    if p == np.inf:
+        return (2 * M + 1)**n
+    slices = range(M + 1)
+    if workers == 1:
+        return sum(count_slice(n, p, M, a1, chunk_states) for a1 in slices)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(count_slice, [n] * (M + 1), [p] * (M + 1), [M] * (M + 1),
+                            slices, [chunk_states] * (M + 1)))
+
+
+# Konvergenzstudie: Anzahl, Volumenschätzung und Fehler für mehrere M
+def convergence(n, p, Ms, workers=None):
+    exact = ball_volume(n, p)
+    rows = []
+    for M in Ms:
+        start = time.perf_counter()
+        count = count_lattice_points(n, p, M, workers)
+        estimate = count / M**n
+        rows.append({
+            'n': n, 'p': p, 'M': M, 'count': count,
+            'volume_estimate': estimate, 'volume': exact,
+            'relative_error': abs(estimate - exact) / exact,
+            'time': time.perf_counter() - start,
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    for n, Ms in [(3, (100, 200, 400, 800)), (5, (20, 40, 80)), (8, (10, 20, 40))]:
+        for p in (1, 2):
+            for row in convergence(n, p, Ms):
+                print(f"n={n} p={p} M={row['M']:3d}: {row['count']:>16d} Punkte, "
+                      f"V ≈ {row['volume_estimate']:.6f} (exakt {row['volume']:.6f}, "
+                      f"rel. Fehler {row['relative_error']:.2e}, {row['time']:.2f} s)")
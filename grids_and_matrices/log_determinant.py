@@ -0,0 +1,257 @@
+'''
+Stabile Log-Determinante mit Fehlerschätzung (Erweiterung von Aufgabe 8).
+
+np.linalg.det liefert für die Hilbert-Matrix Werte um 1e-53 mit großem
+relativen Fehler und läuft für größere N auf 0. Hier wird stattdessen
+(Vorzeichen, ln|det|) über eine LU-Zerlegung berechnet, auch für Stapel
+(..., N, N) vieler Matrizen zugleich. Die Genauigkeit wird über die
+Kondition κ₁ = ‖A‖₁ ‖A⁻¹‖₁ abgeschätzt: eine Rückwärtsstörung der Größe
+η‖A‖ verschiebt ln|det| um höchstens etwa N κ₁ η.
+
+Nur wenn diese Schätzung die gewünschte Genauigkeit rtol verfehlt, wird
+eskaliert, und zwar nur für die betroffenen Matrizen:
+
+    float64     np.linalg.slogdet und np.linalg.cond (LAPACK, gestapelt)
+    extended    Nachiteration der LU-Faktoren: R = PA - LU in long double,
+                Korrektur F = L⁻¹ R U⁻¹ in float64, L += L·tril(F, -1),
+                U += triu(F)·U. Jeder Schritt gewinnt etwa -log10(κ ε)
+                Stellen, bis zur long-double-Genauigkeit. Nur sinnvoll
+                für κ ε < 1 (sonst konvergiert die Korrektur nicht) und
+                nur, wo long double genauer als float64 ist.
+    mpmath      LU-Zerlegung in so vielen Dezimalstellen, wie κ verlangt;
+                κ wird in derselben Genauigkeit mit dem Schätzer von
+                Hager/Higham nachgemessen und die Stellenzahl bei Bedarf
+                erhöht.
+
+Das Ergebnis ist die Determinante der übergebenen float64-Matrix (bei der
+Hilbert-Matrix also der bereits gerundeten Einträge).
+'''
+import math
+
+import numpy as np
+
+EPS = np.finfo(np.float64).eps
+EXTENDED_EPS = np.finfo(np.longdouble).eps
+REFINE_STEPS = 3
+GUARD_DIGITS = 10  # zusätzliche Stellen bei der Eskalation
+MIN_DPS = 30
+
+
+# LU-Zerlegung mit Spaltenpivotsuche für einen Stapel (B, n, n):
+# (L und U in einem Array, Zeilenpermutation, Vorzeichen der Permutation)
+def lu_factor(A):
+    LU = np.array(A, dtype=np.float64)
+    batch, n, _ = LU.shape
+    stack = np.arange(batch)
+    perm = np.tile(np.arange(n), (batch, 1))
+    sign = np.ones(batch)
+    for k in range(n):
+        p = k + np.argmax(np.abs(LU[:, k:, k]), axis=1)
+        swap = p != k
+        if np.any(swap):
+            rows_k, perm_k = LU[stack, k].copy(), perm[stack, k].copy()
+            LU[stack, k], perm[stack, k] = LU[stack, p], perm[stack, p]
+            LU[stack, p], perm[stack, p] = rows_k, perm_k
+            sign[swap] = -sign[swap]
+        pivot = LU[:, k, k]
+        pivot = np.where(pivot == 0, 1.0, pivot)  # singulär: Spalte bleibt stehen
+        LU[:, k + 1:, k] /= pivot[:, np.newaxis]
+        LU[:, k + 1:, k + 1:] -= LU[:, k + 1:, k, np.newaxis] * LU[:, k, np.newaxis, k + 1:]
+    return LU, perm, sign
+
+
+# Nachiteration der Faktoren PA ≈ LU mit Residuum in long double
+def refine_lu(A, LU, perm, steps=REFINE_STEPS):
+    batch, n, _ = LU.shape
+    PA = np.take_along_axis(np.asarray(A, dtype=np.longdouble), perm[:, :, np.newaxis], axis=1)
+    L = (np.tril(LU, -1) + np.eye(n)).astype(np.longdouble)
+    U = np.triu(LU).astype(np.longdouble)
+    for _ in range(steps):
+        R = PA - np.matmul(L, U)
+        L64, U64 = L.astype(np.float64), U.astype(np.float64)
+        # F = L⁻¹ R U⁻¹ (Korrektur, float64 genügt)
+        X = np.linalg.solve(L64, R.astype(np.float64))
+        F = np.swapaxes(np.linalg.solve(np.swapaxes(U64, 1, 2), np.swapaxes(X, 1, 2)), 1, 2)
+        L += np.matmul(L64, np.tril(F, -1))
+        U += np.matmul(np.triu(F), U64)
+    R = PA - np.matmul(L, U)
+    backward = (np.abs(R).sum(axis=1).max(axis=1)
+                / np.abs(PA).sum(axis=1).max(axis=1)).astype(np.float64)
+    return L, U, backward
+
+
+# Nötige Dezimalstellen, damit N κ 10^(-dps) ≤ rtol
+def required_digits(n, kappa, rtol, max_dps):
+    if not np.isfinite(kappa):
+        return max_dps
+    digits = math.log10(max(n * kappa / rtol, 1.0))
+    return int(min(max_dps, max(MIN_DPS, math.ceil(digits) + GUARD_DIGITS)))
+
+
+def _mp_lu(a):
+    import mpmath as mp
+
+    n = len(a)
+    perm = list(range(n))
+    sign = 1
+    for k in range(n):
+        p = max(range(k, n), key=lambda i: abs(a[i][k]))
+        if a[p][k] == 0:
+            return a, perm, 0
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            perm[k], perm[p] = perm[p], perm[k]
+            sign = -sign
+        row_k = a[k]
+        for i in range(k + 1, n):
+            row_i = a[i]
+            factor = row_i[k] / row_k[k]
+            row_i[k] = factor
+            if factor:
+                for j in range(k + 1, n):
+                    row_i[j] -= factor * row_k[j]
+    return a, perm, sign
+
+
+# ‖A⁻¹‖₁ nach Hager/Higham: wenige Lösungen mit A und Aᵀ über die LU-Faktoren
+def _mp_inverse_norm(lu, perm):
+    n = len(lu)
+
+    def solve(b):  # A x = b: L U x = P b
+        y = [b[perm[i]] for i in range(n)]
+        for i in range(n):
+            y[i] -= sum(lu[i][j] * y[j] for j in range(i))
+        for i in reversed(range(n)):
+            y[i] = (y[i] - sum(lu[i][j] * y[j] for j in range(i + 1, n))) / lu[i][i]
+        return y
+
+    def solve_transposed(b):  # Aᵀ z = b: Uᵀ Lᵀ P z = b
+        w = list(b)
+        for i in range(n):
+            w[i] = (w[i] - sum(lu[j][i] * w[j] for j in range(i))) / lu[i][i]
+        for i in reversed(range(n)):
+            w[i] -= sum(lu[j][i] * w[j] for j in range(i + 1, n))
+        z = [0] * n
+        for i in range(n):
+            z[perm[i]] = w[i]
+        return z
+
+    x = [1 / n] * n
+    estimate = 0
+    for _ in range(5):
+        y = solve(x)
+        estimate = sum(abs(v) for v in y)
+        z = solve_transposed([1 if v >= 0 else -1 for v in y])
+        j = max(range(n), key=lambda i: abs(z[i]))
+        if abs(z[j]) <= sum(zi * xi for zi, xi in zip(z, x)):
+            break
+        x = [0] * n
+        x[j] = 1
+    return estimate
+
+
+# (Vorzeichen, ln|det|, κ₁, Fehlerschätzung) einer Matrix in dps Dezimalstellen
+def mp_slogdet(A, dps):
+    import mpmath as mp
+
+    with mp.workdps(dps):
+        a = [[mp.mpf(x) for x in row] for row in np.asarray(A, dtype=np.float64).tolist()]
+        norm = max(sum(abs(a[i][j]) for i in range(len(a))) for j in range(len(a)))
+        lu, perm, sign = _mp_lu(a)
+        if sign == 0:  # exakt singulär
+            return 0, -math.inf, math.inf, 0.0
+        logabsdet = mp.fsum(mp.log(abs(lu[k][k])) for k in range(len(lu)))
+        for k in range(len(lu)):
+            if lu[k][k] < 0:
+                sign = -sign
+        kappa = norm * _mp_inverse_norm(lu, perm)
+        error = len(lu) * kappa * mp.mpf(10)**(-dps)
+        return sign, float(logabsdet), float(kappa), float(error)
+
+
+# (Vorzeichen, ln|det|) mit Fehlerschätzung für eine Matrix oder einen Stapel (..., N, N)
+def slogdet(A, rtol=1e-8, max_dps=2000):
+    A = np.asarray(A, dtype=np.float64)
+    shape = A.shape[:-2]
+    n = A.shape[-1]
+    A = A.reshape((-1, n, n))
+
+    sign, logabsdet = np.linalg.slogdet(A)
+    with np.errstate(all='ignore'):
+        kappa = np.where(sign == 0, np.inf, np.linalg.cond(A, 1))
+        kappa = np.nan_to_num(kappa, nan=np.inf)
+        error = n * kappa * EPS
+    precision = np.full(len(A), 'float64', dtype=object)
+    dps = np.full(len(A), 16)
+
+    # extended: Nachiteration der LU-Faktoren, wo float64 nicht reicht, aber κ ε < 1
+    todo = np.nonzero((error > rtol) & (kappa * EPS < 0.1))[0]
+    if EXTENDED_EPS < EPS and len(todo):
+        LU, perm, lu_sign = lu_factor(A[todo])
+        L, U, backward = refine_lu(A[todo], LU, perm)
+        diagonal = np.diagonal(U, axis1=1, axis2=2)
+        refined_error = n * kappa[todo] * np.maximum(backward, EXTENDED_EPS)
+        better = refined_error < error[todo]
+        idx = todo[better]
+        sign[idx] = (lu_sign * np.prod(np.sign(diagonal), axis=1))[better]
+        logabsdet[idx] = np.log(np.abs(diagonal)).sum(axis=1).astype(np.float64)[better]
+        error[idx] = refined_error[better]
+        precision[idx] = 'extended'
+        dps[idx] = int(-np.log10(EXTENDED_EPS))
+
+    # mpmath: Stellen aus κ, nach der Rechnung mit dem genau gemessenen κ nachprüfen
+    for i in np.nonzero(error > rtol)[0]:
+        # κ ε ≥ 0.1: die float64-Schätzung ist gesättigt, κ kann viel größer sein
+        guess = kappa[i] if kappa[i] * EPS < 0.1 else 1 / EPS**2
+        digits = required_digits(n, guess, rtol, max_dps)
+        while True:
+            s, value, k, e = mp_slogdet(A[i], digits)
+            needed = required_digits(n, k, rtol, max_dps) if s else digits
+            if needed <= digits or digits >= max_dps:
+                break
+            digits = needed
+        sign[i], logabsdet[i], kappa[i], error[i] = s, value, k, e
+        precision[i] = 'mpmath'
+        dps[i] = digits
+
+    # Rundung des Ergebnisses auf float64
+    error += np.abs(np.where(sign == 0, 0.0, logabsdet)) * EPS
+
+    result = {
+        'sign': sign.reshape(shape),
+        'logabsdet': logabsdet.reshape(shape),
+        'condition': kappa.reshape(shape),
+        'error_estimate': error.reshape(shape),
+        'precision': precision.reshape(shape),
+        'dps': dps.reshape(shape),
+    }
+    if not shape:
+        result = {key: value[()] for key, value in result.items()}
+    return result
+
+
+if __name__ == "__main__":
+    import time
+
+    from determinants import hilbert, hilbert_det
+
+    for N in (5, 10, 12, 14, 20, 50):
+        H = np.array(hilbert(N), dtype=np.float64)
+        exact = hilbert_det(N)
+        exact_log = math.log(exact.numerator) - math.log(exact.denominator)
+        start = time.perf_counter()
+        r = slogdet(H)
+        print(f"N = {N:3d}: ln|det| = {r['logabsdet']:.12f} (ungerundetes H_N: {exact_log:.12f}), "
+              f"κ₁ = {r['condition']:.1e}, Fehlerschätzung {r['error_estimate']:.1e}, "
+              f"{r['precision']} ({r['dps']} Stellen), {time.perf_counter() - start:.3f} s")
+
+    # viele mäßig schlecht konditionierte Matrizen auf einmal
+    rng = np.random.default_rng(0)
+    D = 10.0**rng.uniform(-9, 0, size=(2000, 8))
+    Q, _ = np.linalg.qr(rng.standard_normal((2000, 8, 8)))
+    batch = Q * D[:, np.newaxis, :] @ np.swapaxes(Q, 1, 2)
+    start = time.perf_counter()
+    r = slogdet(batch)
+    levels = {p: int(np.sum(r['precision'] == p)) for p in ('float64', 'extended', 'mpmath')}
+    print(f"Stapel 2000×8×8: {time.perf_counter() - start:.2f} s, Stufen {levels}, "
+          f"max. Fehlerschätzung {r['error_estimate'].max():.1e}")
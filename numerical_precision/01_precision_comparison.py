@@ -2,8 +2,7 @@
 #Aufgabe01
 ###############################################################################
 
-import sympy as sy
-import decimal as dec
+from low_precision import decimal_sum, exact_sum, harmonic_terms
 
 zahlen = [10**2,10**3,10**4,3*10**4]
 
@@ -18,26 +17,22 @@ for n in zahlen:
     print(harmonika1(n))
 
 
-#Mantisse fünfstellig
+# Summanden 1/i für alle n auf einmal; Teilsummen an den Stellen n-1
+terme = harmonic_terms(max(zahlen))
+stellen = [n - 1 for n in zahlen]
+
+#Mantisse fünfstellig (wie Decimal mit prec = 5, Rundung nach jedem Schritt)
 def harmonika2(n):
-    dec.getcontext().prec = 5
-    s=0
-    for i in range(1,n):
-        s= dec.Decimal(s)+dec.Decimal(1/i)
-    return s
+    return decimal_sum(harmonic_terms(n), 5)[0]
 
-for n in zahlen:
-    print(harmonika2(n))
+for s in decimal_sum(terme, 5, stellen):
+    print(s)
 
-#Mantisse vierstellig
+#Exakte Summe der Gleitkommawerte 1/i (wie mit sy.Rational)
 def harmonika3(n):
-    dec.getcontext().prec = 5
-    s=0
-    for i in range(1,n):
-        s= sy.Rational(s)+sy.Rational(1/i)
-    return s
+    return exact_sum(harmonic_terms(n))[0]
 
-for n in zahlen:
-    print(harmonika3(n))
+for s in exact_sum(terme, stellen):
+    print(s)
 
 print(harmonika2(1000))
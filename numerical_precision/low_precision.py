@@ -0,0 +1,295 @@
+'''
+Emulierte Gleitkommaarithmetik mit p Stellen auf NumPy-Feldern (Erweiterung von Aufgabe 1).
+
+harmonika2 addiert mit decimal.Decimal in p = 5 Dezimalstellen, harmonika3
+exakt mit SymPy-Rationals, jeweils Element für Element. Hier werden dieselben
+Ergebnisse für viele Summanden auf einmal berechnet.
+
+Sequentielle Summation mit Rundung nach jedem Schritt (round half even):
+
+    s_{k+1} = rd_p(s_k + x_k),    x_k exakt als float64 (wie Decimal(1/i)).
+
+Der Zustand ist s = a · β^m mit β ∈ {10, 2} und β^(p-1) ≤ |a| < β^p. Solange
+s in derselben Dekade (bzw. Binade) bleibt, ist das Quantum u = β^m fest und
+ein Schritt lautet a_{k+1} = a_k + rd(x_k / u): die Rundung hängt nicht von
+a_k ab, außer bei einem exakten Gleichstand (dann entscheidet die Parität von
+a_k). Die Schritte eines Blocks ergeben sich daher mit np.cumsum. x/u wird
+für β = 2 exakt mit np.ldexp berechnet, für β = 10 als Produkt mit 10^(-m)
+exakt über Veltkamp-Zerlegung (bzw. doppelt genau, falls 10^(-m) nicht exakt
+darstellbar ist).
+
+Ein Schritt gilt nur dann als sicher, wenn x/u nicht in der Nähe eines
+Gleichstands liegt und die exakte Summe sicher in der Dekade von s bleibt.
+Der erste unsichere Schritt eines Blocks wird exakt mit Fraction gerundet
+(neue Dekade, Gleichstand, Vorzeichenwechsel), danach geht es mit dem
+nächsten Block weiter. Die Blocklänge wächst, solange keine Sonderfälle
+auftreten. Das gilt auch für Summanden, deren Quotient x/u außerhalb des
+float64-Bereichs liegt (|x| nahe 1e±300 im Verhältnis zu s): diese Schritte
+werden ebenfalls exakt gerechnet, sind also korrekt, aber langsam.
+
+Das Ergebnis ist für alle endlichen Summanden bitgenau dasselbe wie die
+Schleife mit Decimal (β = 10) bzw. mit float64 (β = 2, p = 53, solange die
+float64-Summe nicht überläuft: der Exponent ist hier unbeschränkt); siehe
+compare_reference.
+
+exact_sum liefert die exakte Summe der float64-Werte (harmonika3) über
+Mantissen und Exponenten aus np.frexp, gruppiert nach Exponent.
+'''
+import decimal
+import math
+import time
+from fractions import Fraction
+
+import numpy as np
+
+MAX_DIGITS = {10: 15, 2: 53}  # β^p ≤ 2^53: Zustand und Quotient bleiben exakt
+CHUNK_MIN = 256
+CHUNK_MAX = 1 << 18
+EXACT_CHUNK = 1 << 24         # Summen der halben Mantissen bleiben < 2^53
+SPLIT = 2.0**27 + 1           # Veltkamp-Zerlegung für das exakte Produkt
+MAX_SPLIT = 2.0**990          # größere |x| laufen in SPLIT · x über
+MAX_SCALE_EXPONENT = 290      # 10^(±m) samt Korrekturterm normal darstellbar
+
+
+# Harmonische Summanden 1/i für i = 1, ..., n-1 (wie range(1, n) in Aufgabe 1)
+def harmonic_terms(n):
+    return 1.0 / np.arange(1, n, dtype=np.float64)
+
+
+def _split(x):
+    c = SPLIT * x
+    high = c - (c - x)
+    return high, x - high
+
+
+# x · c = high + low exakt (ohne Über-/Unterlauf; der Aufrufer prüft den Bereich)
+def _two_product(x, c):
+    product = x * c
+    xh, xl = _split(x)
+    ch, cl = _split(np.float64(c))
+    error = ((xh * ch - product) + xh * cl + xl * ch) + xl * cl
+    return product, error
+
+
+# Quantum β^m als float (0 bei Unterlauf, inf bei Überlauf)
+def _quantum(m, base):
+    try:
+        return float(Fraction(base)**m)
+    except OverflowError:
+        return math.inf
+
+
+# q = rd(x / β^m) elementweise und Maske der Schritte, die exakt nachgerechnet werden müssen.
+# Außerhalb des sicheren Bereichs (10^(-m) nicht als float, |x| zu groß für die
+# Zerlegung, Über-/Unterlauf) ist der Schritt unsicher und wird exakt gerechnet.
+def _quantize(x, m, base):
+    if base == 10 and not -MAX_SCALE_EXPONENT <= m <= MAX_SCALE_EXPONENT:
+        return np.zeros(len(x), dtype=np.int64), np.ones(len(x), dtype=bool)
+
+    with np.errstate(invalid='ignore', over='ignore', under='ignore'):
+        if base == 2:
+            high, low, tol = np.ldexp(x, -m), 0.0, 0.0
+        elif -22 <= m <= 0:
+            high, low = _two_product(x, 10.0**-m)  # 10^(-m) exakt darstellbar
+            tol = 0.0
+        else:
+            scale = Fraction(10)**-m
+            c_high = float(scale)
+            c_low = float(scale - Fraction(c_high))
+            high, low = _two_product(x, c_high)
+            low = low + x * c_low
+            tol = np.abs(high) * 2.0**-100  # Fehler der doppelt genauen Konstante
+
+        q = np.rint(high)
+        f = (high - q) + low
+        tol = tol + 2.0**-50  # Rundung von f
+        special = ~(np.abs(high) < 2.0**51) | ~np.isfinite(f) | ~(np.abs(x) < MAX_SPLIT)
+        special |= np.abs(np.abs(f) - 0.5) <= tol
+        q += np.where(np.abs(f) > 0.5, np.sign(f), 0.0)
+    q[special] = 0.0
+    return q.astype(np.int64), special
+
+
+# Exakte Rundung eines Bruchs auf p Stellen zur Basis β → (a, m), v = a · β^m
+def _round_fraction(value, p, base):
+    if value == 0:
+        return 0, 0
+    sign = -1 if value < 0 else 1
+    value = abs(value)
+    m = math.floor((math.log(value.numerator) - math.log(value.denominator))
+                   / math.log(base)) - p + 1
+    low, high = base**(p - 1), base**p
+    while value / Fraction(base)**m >= high:
+        m += 1
+    while value / Fraction(base)**m < low:
+        m -= 1
+    a = round(value / Fraction(base)**m)  # Fraction rundet half even
+    if a == high:
+        a, m = a // base, m + 1
+    return sign * a, m
+
+
+# Ein Schritt s + x exakt gerechnet und gerundet
+def _exact_step(a, m, x, p, base):
+    return _round_fraction(Fraction(a) * Fraction(base)**m + Fraction(float(x)), p, base)
+
+
+# Sequentielle Summe mit p Stellen; Zustände (a, m) nach checkpoints Summanden
+def rounded_sum(terms, p, base=10, checkpoints=None):
+    if base not in MAX_DIGITS:
+        raise ValueError("base muss 10 oder 2 sein")
+    if not 1 <= p <= MAX_DIGITS[base]:
+        raise ValueError(f"p muss zwischen 1 und {MAX_DIGITS[base]} liegen (base={base})")
+    terms = np.asarray(terms, dtype=np.float64).ravel()
+    n = len(terms)
+    checkpoints = [n] if checkpoints is None else sorted(checkpoints)
+    if checkpoints and not 0 <= checkpoints[0] <= checkpoints[-1] <= n:
+        raise ValueError("checkpoints müssen zwischen 0 und len(terms) liegen")
+
+    low, high = base**(p - 1), base**p
+    a, m = 0, 0
+    pos = 0
+    size = CHUNK_MIN
+    states = []
+    pending = iter(checkpoints)
+    next_check = next(pending, None)
+
+    while True:
+        while next_check is not None and next_check == pos:
+            states.append((a, m))
+            next_check = next(pending, None)
+        if next_check is None:
+            break
+
+        if a == 0:
+            a, m = _exact_step(a, m, terms[pos], p, base)
+            pos += 1
+            continue
+
+        end = min(pos + size, next_check)
+        x = terms[pos:end]
+        # Stillstand: alle |x| < u/2, s ändert sich nicht (häufig bei kleinem p)
+        if np.abs(x).max() < 0.499 * _quantum(m, base) and (
+                abs(a) > low or np.all(x * np.sign(a) >= 0)):
+            pos = end
+            size = min(CHUNK_MAX, 2 * size)
+            continue
+        q, special = _quantize(x, m, base)
+        trajectory = a + np.cumsum(q)
+        previous = np.concatenate(([a], trajectory[:-1]))
+        magnitude = np.abs(trajectory)
+        # exakte Summe liegt sicher in [β^(p-1), β^p): |a_{k+1}| mit Abstand 1 zu den Grenzen,
+        # oder Stillstand am unteren Rand mit Summand gleichen Vorzeichens
+        safe = (magnitude > low) & (magnitude < high)
+        safe |= (q == 0) & (np.abs(previous) == low) & (x * np.sign(previous) >= 0)
+        safe &= ~special & (np.abs(q) <= 2 * high)
+
+        if safe.all():
+            a = int(trajectory[-1])
+            pos = end
+            size = min(CHUNK_MAX, 2 * size)
+            continue
+
+        first = int(np.argmin(safe))
+        if first > 0:
+            a = int(trajectory[first - 1])
+        a, m = _exact_step(a, m, terms[pos + first], p, base)
+        pos += first + 1
+        size = max(CHUNK_MIN, 2 * first)
+
+    return states
+
+
+# Summe wie mit decimal.Decimal in p Stellen (harmonika2); Liste von Decimal
+def decimal_sum(terms, digits, checkpoints=None):
+    return [decimal.Decimal(f"{a}E{m}")
+            for a, m in rounded_sum(terms, digits, 10, checkpoints)]
+
+
+# Summe in binärer Gleitkommaarithmetik mit p Bits; Liste von Fraction (p = 53: float64)
+def binary_sum(terms, bits, checkpoints=None):
+    return [Fraction(a) * Fraction(2)**m
+            for a, m in rounded_sum(terms, bits, 2, checkpoints)]
+
+
+# Exakte Summe der float64-Werte (harmonika3); Liste von Fraction
+def exact_sum(terms, checkpoints=None):
+    terms = np.asarray(terms, dtype=np.float64).ravel()
+    n = len(terms)
+    checkpoints = [n] if checkpoints is None else sorted(checkpoints)
+    total = Fraction(0)
+    sums = []
+    pos = 0
+    for stop in checkpoints:
+        for start in range(pos, stop, EXACT_CHUNK):
+            total += _exact_chunk(terms[start:min(stop, start + EXACT_CHUNK)])
+        pos = max(pos, stop)
+        sums.append(total)
+    return sums
+
+
+# x = M · 2^E mit ganzzahligem |M| < 2^53; M = M_hoch · 2^26 + M_tief
+def _exact_chunk(x):
+    if not np.all(np.isfinite(x)):
+        raise ValueError("Summanden müssen endlich sein")
+    mantissa, exponent = np.frexp(x)
+    M = np.ldexp(mantissa, 53).astype(np.int64)
+    exponents, index = np.unique(exponent, return_inverse=True)
+    high = np.bincount(index, weights=M >> 26)  # Teilsummen < 2^53: exakt in float64
+    low = np.bincount(index, weights=M & ((1 << 26) - 1))
+    total = Fraction(0)
+    for e, h, l in zip(exponents.tolist(), high.tolist(), low.tolist()):
+        total += Fraction((int(h) << 26) + int(l)) * Fraction(2)**(e - 53)
+    return total
+
+
+# Vergleich mit der Schleife aus Aufgabe 1 (Decimal, float64, Fraction); Anzahl Abweichungen
+def compare_reference(terms, digits=(1, 2, 3, 5, 8, 12, 15), checkpoints=None):
+    terms = np.asarray(terms, dtype=np.float64)
+    checkpoints = [len(terms)] if checkpoints is None else sorted(checkpoints)
+    mismatches = {}
+    for p in digits:
+        context = decimal.Context(prec=p, rounding=decimal.ROUND_HALF_EVEN)
+        s, reference, k = decimal.Decimal(0), [], 0
+        for stop in checkpoints:
+            for x in terms[k:stop].tolist():
+                s = context.add(s, decimal.Decimal(x))
+            k = max(k, stop)
+            reference.append(s)
+        result = decimal_sum(terms, p, checkpoints)
+        mismatches[f'decimal{p}'] = sum(r != e for r, e in zip(result, reference))
+
+    s, reference, k = 0.0, [], 0
+    for stop in checkpoints:
+        for x in terms[k:stop].tolist():
+            s = s + x
+        k = max(k, stop)
+        reference.append(s)
+    result = binary_sum(terms, 53, checkpoints)
+    mismatches['float64'] = sum(r != Fraction(e) for r, e in zip(result, reference))
+
+    reference = [sum(map(Fraction, terms[:stop].tolist()), Fraction(0)) for stop in checkpoints]
+    mismatches['exact'] = sum(r != e for r, e in zip(exact_sum(terms, checkpoints), reference))
+    return mismatches
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(1)
+    cases = {
+        'harmonisch': harmonic_terms(3001),
+        'Vorzeichenwechsel': rng.standard_normal(3000) * 10.0**rng.integers(-6, 4, 3000),
+        'Gleichstände': rng.integers(-40, 41, 3000) / 8.0,
+    }
+    for name, terms in cases.items():
+        print(f"{name:>18s}: Abweichungen {compare_reference(terms, checkpoints=[10, 100, 3000])}")
+
+    n = 10**7
+    terms = harmonic_terms(n + 1)
+    checkpoints = [10**k for k in range(2, 8)]
+    for base, precisions in ((10, range(1, 16)), (2, (8, 11, 16, 24, 53))):
+        start = time.perf_counter()
+        sums = {p: rounded_sum(terms, p, base, checkpoints)[-1] for p in precisions}
+        print(f"\nβ = {base}, n = {n}: {len(sums)} Genauigkeiten in "
+              f"{time.perf_counter() - start:.1f} s")
+        for p, (a, m) in sums.items():
+            print(f"  p = {p:2d}: {float(Fraction(a) * Fraction(base)**m):.17g}")